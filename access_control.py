@@ -0,0 +1,29 @@
+import re
+from collections import namedtuple
+
+UID_PATTERN = re.compile(r'[0-9A-Fa-f]{8,12}')
+
+AccessDecision = namedtuple('AccessDecision', ['card_id', 'full_name', 'role', 'status', 'reader_id'])
+
+
+class AccessController:
+    def __init__(self, db):
+        self.db = db
+
+    def decide(self, card_id, reader_id=None, trace=None):
+        if not card_id or not UID_PATTERN.fullmatch(card_id):
+            return None
+        # Only reads: newer allowlist snapshots are mapped by the card cache
+        # (here, or on the database worker thread) together with the names
+        card, card_status = self.db.lookup_card(card_id)
+        if trace:
+            trace.mark('lookup')
+        if card_status is None:
+            decision = AccessDecision(card_id, 'Unknown', 'Unknown', 'UNKNOWN_CARD', reader_id)
+        else:
+            status = 'ACCESS_GRANTED' if card_status == 'Active' else 'ACCESS_DENIED'
+            decision = AccessDecision(card_id, card.full_name, card.role, status, reader_id)
+        self.db.log_access(decision.card_id, decision.full_name, decision.role, decision.status, reader_id)
+        if trace:
+            trace.mark('log_write')
+        return decision
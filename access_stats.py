@@ -0,0 +1,107 @@
+import argparse
+from collections import Counter
+
+ROLLUP_TABLES = {
+    # table: (key column, length of the timestamp prefix it keeps)
+    'access_stats_hourly': ('hour', 13),
+    'access_stats_daily': ('day', 10),
+}
+
+
+def create_stats_tables(conn):
+    # Returns True when the tables were just created and need a rebuild
+    created = False
+    for table, (key, _) in ROLLUP_TABLES.items():
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+        if exists:
+            continue
+        conn.execute(f'''
+            CREATE TABLE {table} (
+                {key} TEXT NOT NULL,
+                status TEXT NOT NULL,
+                role TEXT NOT NULL,
+                program TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY ({key}, status, role, program)
+            ) WITHOUT ROWID
+        ''')
+        created = True
+    return created
+
+
+def upsert_counts(conn, table, counts):
+    key = ROLLUP_TABLES[table][0]
+    conn.executemany(f'''
+        INSERT INTO {table} ({key}, status, role, program, count) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT ({key}, status, role, program) DO UPDATE SET count = count + excluded.count
+    ''', [bucket + (count,) for bucket, count in counts.items()])
+
+
+def update_rollups(conn, rows):
+    # rows are access_log inserts: (card_id, full_name, role, status, timestamp, reader_id).
+    # Runs inside the caller's transaction so counts and log rows commit together.
+    card_ids = list({row[0] for row in rows})
+    programs = {}
+    for start in range(0, len(card_ids), 500):
+        chunk = card_ids[start:start + 500]
+        marks = ','.join('?' * len(chunk))
+        programs.update(conn.execute(
+            f"SELECT card_id, program FROM rfid_cards WHERE card_id IN ({marks})", chunk).fetchall())
+    for table, (_, length) in ROLLUP_TABLES.items():
+        counts = Counter(
+            (row[4][:length], row[3], row[2], programs.get(row[0], 'Unknown')) for row in rows
+        )
+        upsert_counts(conn, table, counts)
+
+
+def aggregate_log(conn, schema='main'):
+    counts = {table: Counter() for table in ROLLUP_TABLES}
+    for table, (_, length) in ROLLUP_TABLES.items():
+        for bucket, status, role, program, count in conn.execute(f'''
+            SELECT substr(log.timestamp, 1, {length}), log.status, log.role,
+                   COALESCE(card.program, 'Unknown'), COUNT(*)
+            FROM {schema}.access_log log
+            LEFT JOIN main.rfid_cards card ON card.card_id = log.card_id
+            GROUP BY 1, 2, 3, 4
+        '''):
+            counts[table][(bucket, status, role, program)] += count
+    return counts
+
+
+def rebuild_rollups(conn, archive):
+    # Recomputes both rollups from every monthly archive and the hot table. The
+    # hot table is read in the same transaction that replaces the rollups, so
+    # batches committed by the log writer meanwhile are neither lost nor doubled.
+    totals = {table: Counter() for table in ROLLUP_TABLES}
+    for month in archive.months():
+        conn.execute("ATTACH DATABASE ? AS archive", (archive.path(month),))
+        try:
+            for table, counts in aggregate_log(conn, 'archive').items():
+                totals[table].update(counts)
+        finally:
+            conn.execute("DETACH DATABASE archive")
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for table, counts in aggregate_log(conn).items():
+            totals[table].update(counts)
+        for table, counts in totals.items():
+            conn.execute(f"DELETE FROM {table}")
+            upsert_counts(conn, table, counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the access statistics rollups.')
+    parser.add_argument('--rebuild', action='store_true', help='recompute the rollups from all access log rows')
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+    from database import DatabaseManager
+    db = DatabaseManager()
+    rebuild_rollups(db.conn, db.archive)
+    db.close()
+    print('Access statistics rebuilt.')
+
+
+if __name__ == '__main__':
+    main()
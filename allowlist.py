@@ -0,0 +1,201 @@
+import bisect
+import glob
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from access_control import UID_PATTERN
+
+MAGIC = b'RFAL'
+FORMAT = 1
+# magic, format, reserved, version (time_ns of publication), record count
+HEADER = struct.Struct('<4sHHQQ')
+POINTER_FILE = 'allowlist.current'
+
+# Each record is one little-endian uint64: UID length in hex digits (bits 52-55),
+# UID value (bits 4-51) and status flags (bits 0-3). Records sort by UID.
+STATUS_BITS = 4
+STATUS_MASK = (1 << STATUS_BITS) - 1
+ACTIVE = 1
+
+
+def pack_uid(card_id):
+    # None for anything that is not an 8-12 digit hex UID
+    if not card_id or not UID_PATTERN.fullmatch(card_id):
+        return None
+    return (len(card_id) << 52) | (int(card_id, 16) << STATUS_BITS)
+
+
+def publish_snapshot(conn, directory, keep=2):
+    # Writes a new snapshot file, then points allowlist.current at it with an
+    # atomic rename. Snapshot files are never rewritten in place, so readers
+    # that still map an older one are unaffected (and Windows allows the swap).
+    # The database write lock is held from reading the cards to the rename, so
+    # publishers in different processes take turns and the snapshot left current
+    # was always read after the last change. Returns None when the current
+    # snapshot already holds exactly these cards (e.g. every app start).
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        records = array('Q')
+        for card_id, status in conn.execute("SELECT card_id, status FROM rfid_cards"):
+            key = pack_uid(card_id)
+            if key is not None:
+                records.append(key | (ACTIVE if status == 'Active' else 0))
+        records = array('Q', sorted(records))
+        if sys.byteorder != 'little':
+            records.byteswap()
+        data = records.tobytes()
+        if read_current_records(directory) == data:
+            return None
+        version = time.time_ns()
+        os.makedirs(directory, exist_ok=True)
+        name = f'allowlist-{version}-{os.getpid()}.bin'
+        with open(os.path.join(directory, name), 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT, 0, version, len(records)))
+            file.write(data)
+        pointer = os.path.join(directory, POINTER_FILE)
+        temporary = f'{pointer}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='ascii') as file:
+            file.write(name)
+        os.replace(temporary, pointer)
+    remove_old_snapshots(directory, name, keep)
+    return version
+
+
+def read_current_records(directory):
+    # Record bytes of the published snapshot, or None if there is no valid one
+    try:
+        with open(os.path.join(directory, POINTER_FILE), 'r', encoding='ascii') as file:
+            name = file.read().strip()
+        with open(os.path.join(directory, name), 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, file_format, _, _, count = HEADER.unpack_from(data)
+    if magic != MAGIC or file_format != FORMAT or len(data) != HEADER.size + count * 8:
+        return None
+    return data[HEADER.size:]
+
+
+def remove_old_snapshots(directory, current, keep):
+    names = sorted(os.path.basename(path) for path in glob.glob(os.path.join(directory, 'allowlist-*.bin')))
+    for name in names[:-keep]:
+        if name == current:
+            continue
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            # Still mapped by a reader on Windows; removed on a later publish
+            pass
+
+
+# Read side: maps the current snapshot and answers lookups with a binary
+# search over it, without touching SQLite. Processes mapping the same file
+# share one copy in the page cache. The lock lets the GUI thread look cards up
+# while the database worker thread swaps in a snapshot it just published.
+class Allowlist:
+    def __init__(self, directory, check_interval=1.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.pointer_stat = None
+        self.pointer_name = None
+        self.name = None
+        self.map = None
+        self.records = None
+        self.version = None
+        self.last_check = 0.0
+        self.swaps = 0
+        self.refresh(force=True)
+
+    def read_pointer(self):
+        # Name of the published snapshot, or None when nothing is published yet
+        pointer = os.path.join(self.directory, POINTER_FILE)
+        try:
+            stat = os.stat(pointer)
+            pointer_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if pointer_stat != self.pointer_stat:
+                with open(pointer, 'r', encoding='ascii') as file:
+                    self.pointer_name = file.read().strip()
+                self.pointer_stat = pointer_stat
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Allowlist snapshot error: {e}")
+            return None
+        return self.pointer_name
+
+    def has_update(self):
+        # True when a snapshot other than the mapped one has been published;
+        # looks at most once per check_interval
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_check < self.check_interval:
+                return False
+            self.last_check = now
+            name = self.read_pointer()
+            return name is not None and name != self.name
+
+    def refresh(self, force=False):
+        # Returns True when a newer snapshot was mapped
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self.last_check < self.check_interval:
+                return False
+            self.last_check = now
+            name = self.read_pointer()
+            if name is None or name == self.name:
+                return False
+            try:
+                self.load(name)
+            except (OSError, ValueError) as e:
+                print(f"Allowlist snapshot error: {e}")
+                return False
+            return True
+
+    def load(self, name):
+        with open(os.path.join(self.directory, name), 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, file_format, _, version, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC or file_format != FORMAT or len(mapped) != HEADER.size + count * 8:
+            mapped.close()
+            raise ValueError(f"{name} is not a valid allowlist snapshot")
+        if sys.byteorder == 'little':
+            records = memoryview(mapped)[HEADER.size:].cast('Q')
+        else:
+            records = array('Q', mapped[HEADER.size:])
+            records.byteswap()
+        old_map, old_records = self.map, self.records
+        self.map, self.records, self.version, self.name = mapped, records, version, name
+        self.swaps += 1
+        if old_map is not None:
+            if isinstance(old_records, memoryview):
+                old_records.release()
+            old_map.close()
+
+    def status(self, card_id):
+        # 'Active', 'Inactive', or None for a card that is not registered
+        key = pack_uid(card_id)
+        with self.lock:
+            if key is None or self.records is None:
+                return None
+            index = bisect.bisect_left(self.records, key)
+            if index < len(self.records) and self.records[index] >> STATUS_BITS == key >> STATUS_BITS:
+                return 'Active' if self.records[index] & ACTIVE else 'Inactive'
+            return None
+
+    def __len__(self):
+        return len(self.records) if self.records is not None else 0
+
+    def close(self):
+        with self.lock:
+            if self.map is not None:
+                if isinstance(self.records, memoryview):
+                    self.records.release()
+                self.map.close()
+                self.map = self.records = None
@@ -0,0 +1,71 @@
+import os
+import random
+import tempfile
+import time
+from benchmarks.timing import measure
+
+
+def bench_get_card_by_id(db, card_ids, rng, runs=2000):
+    picks = [(rng.choice(card_ids),) for _ in range(runs)]
+    return {
+        'sqlite': measure(db.get_card_by_id, picks),
+        # The path a tap takes: the in-memory card cache
+        'cached': measure(db.get_card_access, picks),
+    }
+
+
+def bench_log_access(db, card_ids, rng, events=5000):
+    rows = [(card_id, 'Bench User', 'Student', 'ACCESS_GRANTED', 'BENCH')
+            for card_id in (rng.choice(card_ids) for _ in range(events))]
+    submit = []
+    started = time.perf_counter()
+    for row in rows:
+        began = time.perf_counter()
+        db.log_access(*row)
+        submit.append(time.perf_counter() - began)
+    db.flush_logs()
+    elapsed = time.perf_counter() - started
+    submit.sort()
+    return {
+        'events': events,
+        'events_per_second': round(events / elapsed, 1),
+        'submit_p50_ms': round(submit[len(submit) // 2] * 1000, 4),
+        'submit_max_ms': round(submit[-1] * 1000, 4),
+        'writer': db.log_writer_stats(),
+    }
+
+
+def bench_get_access_log(db, runs=200):
+    return {
+        'latest_50': measure(db.get_access_log, [(50,)] * runs),
+        'latest_200': measure(db.get_access_log, [(200,)] * runs),
+        'denied_200': measure(lambda: db.query_access_log(status='ACCESS_DENIED', limit=200), [()] * runs),
+    }
+
+
+def bench_get_all_cards(db, runs=10):
+    return measure(db.get_all_cards, [()] * runs, warmup=1)
+
+
+def bench_export_logs(runs=3):
+    from log_export import export_access_log
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.csv')
+        rows = []
+        result = measure(lambda: rows.append(export_access_log(path)), [()] * runs, warmup=0)
+        result['rows'] = rows[-1]
+        result['rows_per_second'] = round(rows[-1] / (result['mean_ms'] / 1000), 1)
+    return result
+
+
+def run(db, card_ids, seed=1):
+    rng = random.Random(seed)
+    results = {
+        'get_card_by_id': bench_get_card_by_id(db, card_ids, rng),
+        'get_access_log': bench_get_access_log(db),
+        'get_all_cards': bench_get_all_cards(db),
+        'export_logs': bench_export_logs(),
+    }
+    # Writes last, so the read benchmarks see the generated data only
+    results['log_access'] = bench_log_access(db, card_ids, rng)
+    return results
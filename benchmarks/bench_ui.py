@@ -0,0 +1,88 @@
+import os
+from benchmarks.timing import measure
+
+SEARCHES = ['san', 'maria', 'bsit', 'reyes', '09', 'dela cruz', 'zzz']
+
+
+def start_qt():
+    # No display needed: widgets render to an offscreen surface
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def settled(call, model):
+    # The models load through the database worker; time the round trip until
+    # the rows are in the model, as the user sees it.
+    from PyQt5.QtWidgets import QApplication
+
+    def run(*args):
+        call(*args)
+        while model.loading:
+            QApplication.processEvents()
+    return run
+
+
+def bench_load_users(db, runs=20):
+    from config import CONFIG
+    from user_model import UserTableModel
+    model = UserTableModel(db, CONFIG['ui']['user_page_size'])
+    return measure(settled(model.reload, model), [()] * runs)
+
+
+def bench_filter_users(db, runs=5):
+    from config import CONFIG
+    from user_model import UserTableModel
+    model = UserTableModel(db, CONFIG['ui']['user_page_size'])
+    results = {}
+    for text in SEARCHES:
+        results[text] = measure(settled(model.set_search, model), [(text,)] * runs, warmup=1)
+        results[text]['rows'] = model.rowCount()
+    return results
+
+
+def bench_load_access_logs(db, runs=20):
+    from config import CONFIG
+    from log_model import AccessLogModel
+    model = AccessLogModel(db, CONFIG['ui']['log_rows'])
+    return {
+        'reload': measure(settled(model.reload, model), [()] * runs),
+        # What every log writer flush triggers while the window is open
+        'refresh': measure(settled(model.refresh, model), [()] * runs),
+    }
+
+
+def bench_users_table_paint(db, runs=20):
+    # Model reload plus laying out and painting the visible rows in a QTableView
+    from PyQt5.QtWidgets import QTableView
+    from config import CONFIG
+    from user_model import UserTableModel
+    model = UserTableModel(db, CONFIG['ui']['user_page_size'])
+    view = QTableView()
+    view.setModel(model)
+    view.resize(1200, 700)
+    view.show()
+
+    def reload_and_paint():
+        settled(model.reload, model)()
+        view.viewport().repaint()
+    result = measure(reload_and_paint, [()] * runs)
+    view.close()
+    return result
+
+
+def run(db):
+    app = start_qt()
+    from db_worker import AsyncDatabase
+    async_db = AsyncDatabase(db)
+    try:
+        results = {
+            'load_users': bench_load_users(async_db),
+            'filter_users': bench_filter_users(async_db),
+            'load_access_logs': bench_load_access_logs(async_db),
+            'users_table_paint': bench_users_table_paint(async_db),
+        }
+    finally:
+        async_db.stop()
+    app.processEvents()
+    return results
@@ -0,0 +1,150 @@
+import argparse
+import hashlib
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+FIRST_NAMES = ['Maria', 'Jose', 'Juan', 'Ana', 'Mark', 'Angel', 'John', 'Grace', 'Paul', 'Joy',
+               'Carlo', 'Kristine', 'Miguel', 'Andrea', 'Rafael', 'Nicole', 'Jerome', 'Camille']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores',
+              'Villanueva', 'Ramos', 'Castillo', 'Aquino', 'Navarro', 'Dela Cruz', 'Gonzales']
+PROGRAMS = ['BSIT', 'BSCS', 'BSED', 'BEED', 'BSHM', 'BSBA', 'BSIE', 'BTLED', 'Faculty', 'Staff']
+READERS = ['MAIN', 'GATE-B']
+
+
+def photo_bytes(rng, photo_kb):
+    # Random bytes don't compress, like JPEG data; sizes vary around photo_kb
+    size = max(1024, int(rng.gauss(photo_kb, photo_kb / 4) * 1024))
+    return rng.randbytes(size) if hasattr(rng, 'randbytes') else os.urandom(size)
+
+
+def make_cards(rng, count, photo_kb):
+    seen = set()
+    cards = []
+    while len(cards) < count:
+        card_id = f"{rng.getrandbits(32):08X}"
+        if card_id in seen:
+            continue
+        seen.add(card_id)
+        role = 'Student' if rng.random() < 0.85 else 'Employee'
+        number = f"{rng.randint(1000000, 9999999)}"
+        cards.append({
+            'card_id': card_id,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'role': role,
+            'school_id': number if role == 'Student' else None,
+            'employee_id': number if role == 'Employee' else None,
+            'phone_number': f"09{rng.randint(100000000, 999999999)}",
+            'program': rng.choice(PROGRAMS[:8] if role == 'Student' else PROGRAMS[8:]),
+            'photo': photo_bytes(rng, photo_kb) if photo_kb else None,
+            'status': 'Active' if rng.random() < 0.95 else 'Inactive',
+        })
+    return cards
+
+
+def insert_cards(conn, cards, chunk_size=1000):
+    for start in range(0, len(cards), chunk_size):
+        chunk = cards[start:start + chunk_size]
+        photos = []
+        rows = []
+        for card in chunk:
+            photo_hash = None
+            if card['photo']:
+                photo_hash = hashlib.sha256(card['photo']).hexdigest()
+                photos.append((photo_hash, card['photo'], len(card['photo'])))
+            rows.append((card['card_id'], card['first_name'], card['last_name'], card['role'],
+                         card['school_id'], card['employee_id'], card['phone_number'],
+                         card['program'], photo_hash, card['status'], 'benchmark'))
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO card_photos (hash, data, size) VALUES (?, ?, ?)", photos)
+            conn.executemany('''
+                INSERT INTO rfid_cards (card_id, first_name, last_name, role, school_id, employee_id,
+                                        phone_number, program, photo, status, registered_by)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+
+def insert_logs(conn, rng, cards, count, days, chunk_size=50000):
+    # Oldest first, as the log writer would have appended them
+    end = datetime.now()
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+    offsets = sorted(rng.random() * span for _ in range(count))
+    pending = []
+    for offset in offsets:
+        timestamp = (start + timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+        if rng.random() < 0.03:
+            row = (f"{rng.getrandbits(32):08X}", 'Unknown', 'Unknown', 'UNKNOWN_CARD')
+        else:
+            card = rng.choice(cards)
+            status = 'ACCESS_GRANTED' if card['status'] == 'Active' else 'ACCESS_DENIED'
+            row = (card['card_id'], f"{card['first_name']} {card['last_name']}", card['role'], status)
+        pending.append(row + (timestamp, rng.choice(READERS)))
+        if len(pending) >= chunk_size:
+            write_logs(conn, pending)
+            pending = []
+    write_logs(conn, pending)
+
+
+def write_logs(conn, rows):
+    with conn:
+        conn.executemany('''
+            INSERT INTO access_log (card_id, full_name, role, status, timestamp, reader_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+
+def point_config_at(path):
+    # Every module reads CONFIG when it opens a connection, so this redirects
+    # the whole app; archives and allowlist snapshots go next to the file, so a
+    # running app never picks up the synthetic roster
+    import config
+    config.CONFIG['database']['path'] = path
+    config.CONFIG['archive']['directory'] = os.path.splitext(path)[0] + '_archive'
+    config.CONFIG['allowlist']['directory'] = os.path.splitext(path)[0] + '_allowlist'
+
+
+def generate(path, cards=10000, logs=500000, photo_kb=40, days=150, seed=1):
+    # Builds a fresh rfid_system.db-shaped database at path; returns the card ids
+    import config
+    from schema import migrate
+    from access_stats import rebuild_rollups
+    from log_archive import LogArchive
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    point_config_at(path)
+    from database import open_connection
+    rng = random.Random(seed)
+    conn = open_connection()
+    try:
+        migrate(conn)
+        card_rows = make_cards(rng, cards, photo_kb)
+        insert_cards(conn, card_rows)
+        insert_logs(conn, rng, card_rows, logs, days)
+        rebuild_rollups(conn, LogArchive(config.CONFIG['archive']['directory']))
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    return [card['card_id'] for card in card_rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill a database with synthetic cards and access log rows.')
+    parser.add_argument('path', nargs='?', default='bench_rfid_system.db')
+    parser.add_argument('--cards', type=int, default=10000)
+    parser.add_argument('--logs', type=int, default=500000)
+    parser.add_argument('--photo-kb', type=int, default=40, help='average photo size; 0 for no photos')
+    parser.add_argument('--days', type=int, default=150, help='spread the access log over this many days')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    generate(args.path, args.cards, args.logs, args.photo_kb, args.days, args.seed)
+    print(f"Generated {args.path}: {args.cards} cards, {args.logs} log rows "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime
+
+from benchmarks.generate import generate, point_config_at
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=''):
+    # {'a': {'b': {'mean_ms': 1}}} -> {'a.b': 1}, the figure compared across runs
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if 'mean_ms' in value:
+                flat[name] = value['mean_ms']
+            elif 'events_per_second' in value:
+                flat[name + ' (events/s)'] = value['events_per_second']
+            else:
+                flat.update(flatten(value, name + '.'))
+    return flat
+
+
+def compare(baseline_path, results):
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = flatten(json.load(file)['results'])
+    current = flatten(results)
+    print(f"{'benchmark':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, value in current.items():
+        before = baseline.get(name)
+        if not before:
+            print(f"{name:<44} {'-':>10} {value:>10.3f}")
+            continue
+        print(f"{name:<44} {before:>10.3f} {value:>10.3f} {(value - before) / before * 100:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the database and UI hot paths on synthetic data.')
+    parser.add_argument('--cards', type=int, default=10000)
+    parser.add_argument('--logs', type=int, default=500000)
+    parser.add_argument('--photo-kb', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', help='reuse a database made by benchmarks.generate (log_access adds rows to it)')
+    parser.add_argument('--no-ui', action='store_true', help='skip the Qt benchmarks')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='earlier results file to print changes against')
+    args = parser.parse_args()
+    if args.db and not os.path.exists(args.db):
+        # sqlite3.connect would create an empty file and fail later on a missing table
+        parser.error(f'{args.db} does not exist; create it with python -m benchmarks.generate')
+
+    directory = tempfile.mkdtemp(prefix='rfid_bench_')
+    try:
+        report = run(args, args.db or os.path.join(directory, 'rfid_system.db'))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(args.compare, report['results'])
+
+
+def run(args, path):
+    started = time.perf_counter()
+    if args.db:
+        point_config_at(path)
+        with closing(sqlite3.connect(path)) as conn:
+            card_ids = [row[0] for row in conn.execute("SELECT card_id FROM rfid_cards")]
+    else:
+        card_ids = generate(path, args.cards, args.logs, args.photo_kb, seed=args.seed)
+    generate_seconds = time.perf_counter() - started
+
+    # Imported after point_config_at so nothing opens the real database
+    from database import DatabaseManager
+    from benchmarks import bench_db
+    db = DatabaseManager()
+    try:
+        results = {'db': bench_db.run(db, card_ids, args.seed)}
+        if not args.no_ui:
+            from benchmarks import bench_ui
+            results['ui'] = bench_ui.run(db)
+    finally:
+        db.close()
+
+    return {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'dataset': {
+            'cards': len(card_ids),
+            'logs': args.logs if not args.db else None,
+            'photo_kb': args.photo_kb if not args.db else None,
+            'seed': args.seed,
+            'generate_seconds': round(generate_seconds, 2),
+            'size_mb': round(os.path.getsize(path) / 1024 / 1024, 1),
+        },
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import os
+import random
+import select
+import threading
+import time
+import tty
+from datetime import datetime
+
+# What rfid.ino prints after reset, and its replies to the commands it understands
+BANNER = ['RFID System Ready', 'Waiting for cards...', 'MFRC522 Software Version: 0x92', '= v2.0']
+REPLIES = {
+    'STATUS': 'RFID_READY',
+    'RESET': 'RESET_OK',
+    'TEST_BEEP': 'BEEP_OK',
+    'TEST_LED_GREEN': 'LED_GREEN_OK',
+    'TEST_LED_RED': 'LED_RED_OK',
+}
+
+
+# A fake Arduino on a pseudo-terminal. Point a reader's "port" at `port` and
+# the app reads it exactly like the USB serial device (POSIX only).
+class SimulatedReader(threading.Thread):
+    def __init__(self, banner=True):
+        super().__init__(name='SimulatedReader', daemon=True)
+        self.master, self.slave = os.openpty()
+        # Raw mode: no echo and no newline translation, like a real serial line
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.banner = banner
+        self.commands = []
+        self.write_lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def send_line(self, text):
+        # Serial.println terminates lines with CRLF
+        with self.write_lock:
+            os.write(self.master, (text + '\r\n').encode())
+
+    def run(self):
+        if self.banner:
+            for line in BANNER:
+                self.send_line(line)
+        buffer = b''
+        while not self.stop_event.is_set():
+            ready, _, _ = select.select([self.master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(self.master, 1024)
+            except OSError:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                command = line.decode('utf-8', errors='ignore').strip()
+                if not command:
+                    continue
+                # GRANT/DENY only drive LEDs and the buzzer on the real board
+                self.commands.append(command)
+                if command in REPLIES:
+                    self.send_line(REPLIES[command])
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def poisson_arrivals(rate, duration, rng):
+    # Offsets (seconds) of taps arriving at `rate` per second on average
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate)
+        if offset >= duration:
+            return
+        yield offset
+
+
+def shift_change_arrivals(base_rate, peak_rate, duration, rng, period=60.0, peak_seconds=10.0):
+    # Quiet traffic with a burst at the start of every period, like classes letting out
+    offset = 0.0
+    while True:
+        rate = peak_rate if offset % period < peak_seconds else base_rate
+        offset += rng.expovariate(rate)
+        if offset >= duration:
+            return
+        yield offset
+
+
+def synthetic_taps(offsets, card_ids, rng, unknown_ratio=0.05):
+    for offset in offsets:
+        if not card_ids or rng.random() < unknown_ratio:
+            yield offset, f"{rng.getrandbits(32):08X}"
+        else:
+            yield offset, rng.choice(card_ids)
+
+
+def replay_taps(path, speed=1.0):
+    # Rows of an access log export, oldest first, spaced as they happened / speed.
+    # Exports may contain sketch banners logged as card IDs; they are sent as-is.
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = [(row['Timestamp'], row['Card ID']) for row in csv.DictReader(file)]
+    rows.sort()
+    if not rows:
+        return
+    first = datetime.strptime(rows[0][0], '%Y-%m-%d %H:%M:%S')
+    for timestamp, card_id in rows:
+        offset = (datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S') - first).total_seconds()
+        yield offset / speed, card_id
+
+
+def play(reader, taps, on_sent=None, stop_event=None):
+    # Sends each (offset, line) at its offset from now; returns how far behind
+    # schedule the slowest send was, in seconds.
+    started = time.perf_counter()
+    worst_lag = 0.0
+    for offset, line in taps:
+        if stop_event is not None and stop_event.is_set():
+            break
+        wait = started + offset - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            worst_lag = max(worst_lag, -wait)
+        sent = time.perf_counter()
+        # Reported before the write: a fast pipeline can finish the tap before send_line returns
+        if on_sent:
+            on_sent(line, sent)
+        reader.send_line(line)
+    return worst_lag
+
+
+def load_card_ids(db_path):
+    import sqlite3
+    from contextlib import closing
+    with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+        return [row[0] for row in conn.execute("SELECT card_id FROM rfid_cards")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate an RFID reader on a pseudo-terminal.')
+    parser.add_argument('--replay', help='access log export (CSV) to replay')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed-up factor')
+    parser.add_argument('--rate', type=float, default=1.0, help='synthetic taps per second')
+    parser.add_argument('--peak-rate', type=float, help='taps per second during shift-change bursts')
+    parser.add_argument('--period', type=float, default=60.0, help='seconds between bursts')
+    parser.add_argument('--peak-seconds', type=float, default=10.0, help='length of each burst')
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--db', default='rfid_system.db', help='registered card IDs are drawn from here')
+    parser.add_argument('--unknown-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    reader = SimulatedReader()
+    print(f"Simulated reader on {reader.port}")
+    print(f'Set "serial": {{"readers": [{{"id": "SIM", "port": "{reader.port}"}}]}} in rfid_config.json')
+    input('Press Enter to start sending taps...')
+    reader.start()
+    if args.replay:
+        taps = replay_taps(args.replay, args.speed)
+    else:
+        rng = random.Random(args.seed)
+        if args.peak_rate:
+            offsets = shift_change_arrivals(args.rate, args.peak_rate, args.duration, rng,
+                                            args.period, args.peak_seconds)
+        else:
+            offsets = poisson_arrivals(args.rate, args.duration, rng)
+        card_ids = load_card_ids(args.db) if os.path.exists(args.db) else []
+        taps = synthetic_taps(offsets, card_ids, rng, args.unknown_ratio)
+    sent = []
+    try:
+        lag = play(reader, taps, lambda line, _: sent.append(line))
+    except KeyboardInterrupt:
+        lag = 0.0
+    print(f"Sent {len(sent)} lines (worst send lag {lag * 1000:.1f} ms); commands received: {len(reader.commands)}")
+    reader.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+
+from access_control import UID_PATTERN
+from benchmarks.generate import generate, point_config_at
+from benchmarks.serial_sim import (SimulatedReader, play, poisson_arrivals, replay_taps,
+                                   shift_change_arrivals, synthetic_taps)
+from benchmarks.timing import summarize
+from tap_metrics import TapMetrics, TapTrace
+
+
+class LatencyTracker:
+    # Matches each processed card back to when the simulator sent it, oldest first
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(deque)
+        self.latencies = []
+        self.sent = 0
+        self.control_lines = 0
+        self.unmatched = 0
+
+    def on_sent(self, line, sent):
+        with self.lock:
+            if not UID_PATTERN.fullmatch(line):
+                self.control_lines += 1
+                return
+            self.pending[line.upper()].append(sent)
+            self.sent += 1
+
+    def on_done(self, card_id):
+        done = time.perf_counter()
+        with self.lock:
+            queue = self.pending.get(card_id)
+            if not queue:
+                self.unmatched += 1
+                return
+            self.latencies.append(done - queue.popleft())
+
+    def in_flight(self):
+        with self.lock:
+            return sum(len(queue) for queue in self.pending.values())
+
+    def result(self, seconds):
+        dropped = self.in_flight()
+        result = {
+            'sent': self.sent,
+            'processed': len(self.latencies),
+            'dropped': dropped,
+            # Processed cards that matched no sent tap; anything but 0 means the matching is off
+            'unmatched': self.unmatched,
+            'control_lines': self.control_lines,
+            'offered_per_second': round(self.sent / seconds, 2) if seconds else None,
+            'processed_per_second': round(len(self.latencies) / seconds, 2) if seconds else None,
+        }
+        if self.latencies:
+            samples = sorted(self.latencies)
+            result['latency'] = summarize(samples)
+            result['latency']['p99_ms'] = round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 4)
+        return result
+
+
+class CorePipeline:
+    # The gate daemon's path: one SerialMux thread doing filter, decision and log submit
+    def __init__(self, port, dedup_seconds):
+        from access_control import AccessController
+        from database import DatabaseManager
+        from serial_mux import SerialMux
+        from tap_filter import TapFilter
+        self.db = DatabaseManager()
+        self.metrics = TapMetrics()
+        self.controller = AccessController(self.db)
+        self.tap_filter = TapFilter(dedup_seconds)
+        self.tracker = None
+        self.mux = SerialMux([{'id': 'SIM', 'port': port}], self.on_line, reconnect_interval=0.2)
+        self.thread = threading.Thread(target=self.mux.run, daemon=True)
+
+    def on_line(self, reader_id, line):
+        trace = TapTrace(self.mux.line_arrived)
+        trace.mark('read')
+        if not self.tap_filter.accept(reader_id, line):
+            return
+        trace.mark('validate')
+        decision = self.controller.decide(line.upper(), reader_id, trace)
+        if decision is None:
+            return
+        self.metrics.record(trace)
+        if self.tracker is not None:
+            self.tracker.on_done(decision.card_id)
+
+    def start(self):
+        self.thread.start()
+        while self.mux.connected_count() == 0:
+            time.sleep(0.05)
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+
+    def stats(self):
+        return {'tap_filter': self.tap_filter.stats(), 'log_writer': self.db.log_writer_stats(),
+                'stages': self.metrics.snapshot()['stages']}
+
+    def close(self):
+        self.mux.stop()
+        self.thread.join()
+        self.db.close()
+
+
+class GuiPipeline:
+    # The real MainWindow under the offscreen platform, gate display included
+    def __init__(self, port, dedup_seconds):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt5.QtCore import qInstallMessageHandler
+        from PyQt5.QtWidgets import QApplication
+        from config import CONFIG
+        qInstallMessageHandler(self.on_qt_message)
+        CONFIG['gate']['mode'] = 'local'
+        CONFIG['serial']['readers'] = [{'id': 'SIM', 'port': port}]
+        CONFIG['serial']['reconnect_interval'] = 0.2
+        CONFIG['tap_filter']['dedup_seconds'] = dedup_seconds
+        self.app = QApplication.instance() or QApplication([])
+        from ui_main import MainWindow
+        self.window = MainWindow('loadtest')
+        self.window.show()
+        self.tracker = None
+        # Connected after MainWindow's own slot, so it runs once on_card_detected returns
+        self.window.serial_reader.card_detected.connect(self.on_card_done)
+
+    def on_qt_message(self, kind, context, message):
+        # The offscreen platform warns about this every time the gate display updates
+        if 'propagateSizeHints' not in message:
+            print(message, file=sys.stderr)
+
+    def on_card_done(self, card_id, reader_id, trace=None):
+        if self.tracker is not None:
+            self.tracker.on_done(card_id)
+
+    def start(self):
+        # Asks the mux rather than waiting for reader_status: the reader usually
+        # connects while MainWindow is still being built, before anything here could listen
+        while self.window.serial_reader.mux.connected_count() == 0:
+            self.wait(0.05)
+
+    def wait(self, seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def stats(self):
+        return {'tap_filter': self.window.serial_reader.tap_filter.stats(),
+                'log_writer': self.window.db.log_writer_stats(),
+                'stages': self.window.tap_metrics.snapshot()['stages']}
+
+    def close(self):
+        self.window.close()
+
+
+def run_step(pipeline, reader, taps, drain_seconds):
+    tracker = LatencyTracker()
+    pipeline.tracker = tracker
+    done = threading.Event()
+    lag = []
+    started = time.perf_counter()
+
+    def send():
+        lag.append(play(reader, taps, tracker.on_sent))
+        done.set()
+    threading.Thread(target=send, daemon=True).start()
+    # The GUI pipeline needs this thread to keep spinning its event loop
+    while not done.is_set():
+        pipeline.wait(0.01)
+    seconds = time.perf_counter() - started
+    deadline = time.perf_counter() + drain_seconds
+    while tracker.in_flight() and time.perf_counter() < deadline:
+        pipeline.wait(0.01)
+    result = tracker.result(seconds)
+    result['worst_send_lag_ms'] = round(lag[0] * 1000, 2)
+    result['drain_ms'] = round((time.perf_counter() - started - seconds) * 1000, 1)
+    return result
+
+
+def falls_behind(result, max_latency_ms):
+    latency = result.get('latency')
+    return (result['dropped'] > 0 or latency is None or latency['p99_ms'] > max_latency_ms
+            or result['processed'] < result['sent'] * 0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive the tap pipeline from a simulated reader and measure latency.')
+    parser.add_argument('--pipeline', choices=['core', 'gui'], default='core',
+                        help='core: SerialMux + decision + log writer (gate daemon); gui: the real MainWindow')
+    parser.add_argument('--rates', default='1,2,5,10,20,50,100,200',
+                        help='Poisson tap rates (per second) to step through')
+    parser.add_argument('--step-seconds', type=float, default=10.0)
+    parser.add_argument('--peak-rate', type=float, help='add shift-change bursts at this rate on top of each step')
+    parser.add_argument('--period', type=float, default=20.0)
+    parser.add_argument('--peak-seconds', type=float, default=3.0)
+    parser.add_argument('--replay', help='replay an access log export instead of stepping through rates')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed-up factor')
+    parser.add_argument('--cards', type=int, default=5000, help='cards in the generated database')
+    parser.add_argument('--db', help='use a copy of this database instead of a generated one')
+    parser.add_argument('--unknown-ratio', type=float, default=0.05)
+    parser.add_argument('--dedup-seconds', type=float, default=0.0,
+                        help='tap filter window; 0 so every synthetic tap is processed')
+    parser.add_argument('--drain-seconds', type=float, default=10.0)
+    parser.add_argument('--max-latency-ms', type=float, default=500.0,
+                        help='p99 above this counts as falling behind')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='tap_load_results.json')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='rfid_load_')
+    path = os.path.join(directory, 'rfid_system.db')
+    if args.db:
+        shutil.copy(args.db, path)
+        point_config_at(path)
+        from benchmarks.serial_sim import load_card_ids
+        card_ids = load_card_ids(path)
+    else:
+        card_ids = generate(path, args.cards, 0, photo_kb=40, seed=args.seed)
+    rng = random.Random(args.seed)
+    reader = SimulatedReader()
+    reader.start()
+    if args.pipeline == 'gui':
+        pipeline = GuiPipeline(reader.port, args.dedup_seconds)
+    else:
+        pipeline = CorePipeline(reader.port, args.dedup_seconds)
+    steps = []
+    try:
+        pipeline.start()
+        if args.replay:
+            result = run_step(pipeline, reader, replay_taps(args.replay, args.speed), args.drain_seconds)
+            result['replay'] = args.replay
+            steps.append(result)
+        else:
+            for rate in [float(value) for value in args.rates.split(',')]:
+                if args.peak_rate:
+                    offsets = shift_change_arrivals(rate, args.peak_rate, args.step_seconds, rng,
+                                                    args.period, args.peak_seconds)
+                else:
+                    offsets = poisson_arrivals(rate, args.step_seconds, rng)
+                result = run_step(pipeline, reader, synthetic_taps(offsets, card_ids, rng, args.unknown_ratio),
+                                  args.drain_seconds)
+                result['rate'] = rate
+                steps.append(result)
+                latency = result.get('latency', {})
+                print(f"{rate:>8.1f}/s  sent {result['sent']:>6}  processed {result['processed']:>6}  "
+                      f"dropped {result['dropped']:>5}  p50 {latency.get('p50_ms', 0):>8.2f} ms  "
+                      f"p99 {latency.get('p99_ms', 0):>8.2f} ms")
+                if falls_behind(result, args.max_latency_ms):
+                    print(f"Pipeline falls behind at about {rate:g} taps/s")
+                    break
+        stats = pipeline.stats()
+    finally:
+        pipeline.close()
+        reader.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({'pipeline': args.pipeline, 'cards': len(card_ids), 'steps': steps, 'stats': stats},
+                  file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
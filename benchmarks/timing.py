@@ -0,0 +1,25 @@
+import time
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        'runs': count,
+        'mean_ms': round(sum(samples) / count * 1000, 4),
+        'p50_ms': round(samples[count // 2] * 1000, 4),
+        'p95_ms': round(samples[min(count - 1, int(count * 0.95))] * 1000, 4),
+        'max_ms': round(samples[-1] * 1000, 4),
+    }
+
+
+def measure(fn, args_list, warmup=3):
+    # Times fn(*args) once per entry in args_list, after a few untimed calls
+    for args in args_list[:warmup]:
+        fn(*args)
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
@@ -0,0 +1,196 @@
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from access_control import UID_PATTERN
+from photo_utils import normalize_photo
+
+ROSTER_FIELDS = ['card_id', 'first_name', 'last_name', 'role', 'school_id', 'employee_id',
+                 'phone_number', 'program', 'photo']
+REQUIRED_FIELDS = ['card_id', 'first_name', 'last_name', 'role', 'program']
+PHOTO_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+
+ImportIssue = namedtuple('ImportIssue', ['line', 'card_id', 'reason'])
+ImportResult = namedtuple('ImportResult', ['total', 'inserted', 'issues', 'seconds'])
+
+
+def read_roster(path):
+    # CSV with a header row or a JSON list of objects, using the ROSTER_FIELDS names.
+    # Returns (line, record) pairs plus an ImportIssue for each JSON entry that is
+    # not an object; line numbers match the CSV file (header is line 1).
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as file:
+            entries = json.load(file)
+        if not isinstance(entries, list):
+            raise ValueError(f'{os.path.basename(path)} must contain a JSON list of objects')
+    else:
+        with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+            entries = list(csv.DictReader(file))
+    records = []
+    issues = []
+    for index, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            records.append((index + 2, entry))
+        else:
+            issues.append(ImportIssue(index + 2, '', 'entry is not a JSON object'))
+    return records, issues
+
+
+def find_photo(record, photo_dir):
+    if not photo_dir:
+        return None
+    if record.get('photo'):
+        return os.path.join(photo_dir, record['photo'])
+    for extension in PHOTO_EXTENSIONS:
+        path = os.path.join(photo_dir, record['card_id'] + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def prepare_record(job):
+    # Runs in a worker process: validates one roster record and loads its photo.
+    # Returns (line, card tuple or None, error or None).
+    line, record, photo_dir, registered_by = job
+    record = {field: str(record.get(field) or '').strip() for field in ROSTER_FIELDS}
+    record['card_id'] = record['card_id'].upper()
+    missing = [field for field in REQUIRED_FIELDS if not record[field]]
+    if missing:
+        return line, None, f"missing {', '.join(missing)}"
+    if not UID_PATTERN.fullmatch(record['card_id']):
+        return line, None, 'card_id is not an 8-12 digit hex UID'
+    role = record['role'].capitalize()
+    if role not in ('Student', 'Employee'):
+        return line, None, f"unknown role '{record['role']}'"
+    photo = None
+    photo_path = find_photo(record, photo_dir)
+    if photo_path:
+        try:
+            with open(photo_path, 'rb') as file:
+                photo = normalize_photo(file.read())
+        except OSError as e:
+            return line, None, f'cannot read photo: {e}'
+        if photo is None:
+            return line, None, f'unreadable photo {os.path.basename(photo_path)}'
+    card = (
+        record['card_id'], record['first_name'], record['last_name'], role,
+        (record['school_id'] or None) if role == 'Student' else None,
+        (record['employee_id'] or record['school_id'] or None) if role == 'Employee' else None,
+        record['phone_number'] or None, record['program'], photo, registered_by,
+    )
+    return line, card, None
+
+
+def insert_chunk(conn, cards):
+    # One transaction per chunk; returns the cards rejected because their card_id already exists
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        card_ids = [card[0] for card in cards]
+        marks = ','.join('?' * len(card_ids))
+        existing = {row[0] for row in conn.execute(
+            f"SELECT card_id FROM rfid_cards WHERE card_id IN ({marks})", card_ids)}
+        new_cards = [card for card in cards if card[0] not in existing]
+        photos = {}
+        rows = []
+        for card in new_cards:
+            photo_hash = None
+            if card[8]:
+                photo_hash = hashlib.sha256(card[8]).hexdigest()
+                photos[photo_hash] = card[8]
+            rows.append(card[:8] + (photo_hash,) + card[9:])
+        conn.executemany("INSERT OR IGNORE INTO card_photos (hash, data, size) VALUES (?, ?, ?)",
+                         [(photo_hash, data, len(data)) for photo_hash, data in photos.items()])
+        conn.executemany('''
+            INSERT INTO rfid_cards (card_id, first_name, last_name, role, school_id,
+                                  employee_id, phone_number, program, photo, registered_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+    return [card for card in cards if card[0] in existing]
+
+
+def import_roster(conn, roster_path, photo_dir=None, registered_by='import', chunk_size=1000,
+                  workers=None, progress=None, is_cancelled=None):
+    started = time.perf_counter()
+    records, issues = read_roster(roster_path)
+    total = len(records) + len(issues)
+    jobs = [(line, record, photo_dir, registered_by) for line, record in records]
+    record_at = dict(records)
+    seen = set()
+    pending = []
+    line_of = {}
+    inserted = 0
+    processed = 0
+
+    def flush():
+        nonlocal inserted
+        rejected = insert_chunk(conn, pending)
+        inserted += len(pending) - len(rejected)
+        issues.extend(ImportIssue(line_of[card[0]], card[0], 'card_id already registered') for card in rejected)
+        pending.clear()
+
+    # Spawned, not forked: the GUI process calling this already runs Qt and several
+    # threads, and a forked child could inherit a lock one of them held
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        for line, card, error in pool.map(prepare_record, jobs, chunksize=256):
+            processed += 1
+            if error:
+                issues.append(ImportIssue(line, str(record_at[line].get('card_id') or ''), error))
+            elif card[0] in seen:
+                issues.append(ImportIssue(line, card[0], f'duplicate of line {line_of[card[0]]} in this file'))
+            else:
+                seen.add(card[0])
+                line_of[card[0]] = line
+                pending.append(card)
+                if len(pending) >= chunk_size:
+                    flush()
+            if progress and processed % chunk_size == 0:
+                progress(processed, len(jobs))
+            if is_cancelled and is_cancelled():
+                pool.shutdown(cancel_futures=True)
+                break
+        if pending:
+            flush()
+    if progress:
+        progress(processed, len(jobs))
+    issues.sort()
+    return ImportResult(total, inserted, issues, time.perf_counter() - started)
+
+
+def write_report(path, issues):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Line', 'Card ID', 'Problem'])
+        writer.writerows(issues)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import a roster of RFID cards from CSV or JSON.')
+    parser.add_argument('roster', help='CSV (with header) or JSON file with one record per card')
+    parser.add_argument('--photos', help='directory with photos named <card_id>.jpg/.png or by the photo column')
+    parser.add_argument('--report', default='import_report.csv', help='where to write rejected rows')
+    parser.add_argument('--by', default='import', help='value stored in registered_by')
+    parser.add_argument('--workers', type=int, help='worker processes for validation and photo decoding')
+    args = parser.parse_args()
+
+    from database import DatabaseManager
+    db = DatabaseManager()
+    try:
+        result = import_roster(db.conn, args.roster, args.photos, args.by, workers=args.workers,
+                               progress=lambda done, total: print(f"\r{done}/{total}", end='', flush=True))
+        if result.inserted:
+            db.publish_allowlist()
+    finally:
+        db.close()
+    print(f"\nImported {result.inserted} of {result.total} cards in {result.seconds:.1f}s")
+    if result.issues:
+        write_report(args.report, result.issues)
+        print(f"{len(result.issues)} rows rejected, see {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import namedtuple
+
+CardAccess = namedtuple('CardAccess', ['card_id', 'full_name', 'role', 'status'])
+
+
+class CardCache:
+    def __init__(self, conn, check_interval=1.0, allowlist=None):
+        self.conn = conn
+        # When set, a new allowlist snapshot (published on every card change)
+        # triggers the reload instead of data_version, which also moves on
+        # every access log batch the log writer commits.
+        self.allowlist = allowlist
+        # Held while the cards and the mapped snapshot change together, and while
+        # lookup() reads both, so a decision never pairs a new snapshot with old names
+        self.lock = allowlist.lock if allowlist is not None else threading.RLock()
+        # How often (seconds) to ask SQLite whether another process committed
+        self.check_interval = check_interval
+        # Off while a DatabaseWorker owns the connection; it runs check_version itself
+        self.check_on_get = True
+        self.cards = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.version_checks = 0
+        self.data_version = None
+        self.last_check = 0.0
+        self.load()
+
+    def load(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT card_id, first_name, last_name, role, status FROM rfid_cards")
+        cards = {
+            row[0]: CardAccess(row[0], f"{row[1]} {row[2]}", row[3], row[4])
+            for row in cursor.fetchall()
+        }
+        with self.lock:
+            self.cards = cards
+            if self.allowlist is not None:
+                # Mapped only once the names above are in place
+                self.allowlist.refresh(force=True)
+        self.data_version = self.read_data_version()
+        self.last_check = time.monotonic()
+        self.reloads += 1
+
+    def read_data_version(self):
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA data_version")
+        return cursor.fetchone()[0]
+
+    def check_version(self):
+        # data_version only moves when a different connection commits, so our
+        # own writes are applied through put/set_status/remove instead.
+        if self.allowlist is not None:
+            if self.allowlist.has_update():
+                self.load()
+            return
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return
+        self.last_check = now
+        self.version_checks += 1
+        if self.read_data_version() != self.data_version:
+            self.load()
+
+    def get(self, card_id):
+        if self.check_on_get:
+            self.check_version()
+        entry = self.cards.get(card_id)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def lookup(self, card_id):
+        # (entry, status) for a gate decision; with an allowlist the status
+        # comes from the mapped snapshot, read together with the entry. The
+        # cards are never older than the snapshot, so a card the snapshot has
+        # but the cache lacks was deleted since it was published.
+        if self.check_on_get:
+            self.check_version()
+        with self.lock:
+            entry = self.cards.get(card_id)
+            if entry is None:
+                status = None
+            elif self.allowlist is not None:
+                status = self.allowlist.status(card_id)
+            else:
+                status = entry.status
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry, status
+
+    def put(self, card_id, first_name, last_name, role, status='Active'):
+        self.cards[card_id] = CardAccess(card_id, f"{first_name} {last_name}", role, status)
+
+    def set_status(self, card_id, status):
+        entry = self.cards.get(card_id)
+        if entry is not None:
+            self.cards[card_id] = entry._replace(status=status)
+
+    def remove(self, card_id):
+        self.cards.pop(card_id, None)
+
+    def stats(self):
+        return {
+            'size': len(self.cards),
+            'hits': self.hits,
+            'misses': self.misses,
+            'reloads': self.reloads,
+            'version_checks': self.version_checks,
+        }
@@ -0,0 +1,101 @@
+import json
+import os
+
+CONFIG_PATH = os.environ.get('RFID_CONFIG', 'rfid_config.json')
+
+DEFAULTS = {
+    'database': {
+        'path': 'rfid_system.db',
+        # WAL + NORMAL survives application crashes; use FULL to also survive power loss
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        # Page cache per connection; SQLite's default is 2 MB
+        'cache_size_kb': 16384,
+        # Reads go through a memory map of the first mmap_size_mb of the file (0 disables)
+        'mmap_size_mb': 256,
+        # How long a write waits for another connection's lock before failing
+        'busy_timeout_ms': 5000,
+        'temp_store': 'MEMORY',
+    },
+    'serial': {
+        'reconnect_interval': 2.0,
+        # Only used for ports that cannot be waited on with select (Windows COM ports)
+        'poll_interval_ms': 20,
+        'readers': [
+            {'id': 'MAIN', 'port': 'COM3', 'baud_rate': 9600},
+        ],
+    },
+    'tap_filter': {
+        # Repeat reads of the same card at the same reader within this window are dropped
+        'dedup_seconds': 10.0,
+    },
+    'gate': {
+        # 'local': the GUI reads the serial ports itself.
+        # 'daemon': gate_daemon.py owns the readers and the GUI subscribes to its events.
+        'mode': 'local',
+        'host': '127.0.0.1',
+        'port': 8765,
+        'relay_feedback': False,
+    },
+    'ui': {
+        # Most recent access log rows kept in the logs tab; older rows are trimmed
+        'log_rows': 200,
+        # Rows fetched per page in Manage Users; further pages load on scroll
+        'user_page_size': 200,
+        # Decoded card photos kept ready to show, most recently used first
+        'photo_cache_size': 200,
+        'photo_decode_threads': 2,
+        # Gate display: taps kept in its history, for how long, and how long the latest stays up
+        'gate_history_size': 10,
+        'gate_history_seconds': 120,
+        'gate_current_seconds': 10,
+    },
+    'archive': {
+        # access_log rows older than retain_days move to per-month files in directory
+        'enabled': True,
+        'directory': 'archive',
+        'retain_days': 180,
+        'batch_size': 500,
+        'pause_ms': 50,
+        'interval_seconds': 3600,
+    },
+    'allowlist': {
+        # Gate decisions read a memory-mapped snapshot of card IDs and statuses
+        # in directory, republished whenever cards change, instead of SQLite.
+        # null puts it next to the database (rfid_system_allowlist for rfid_system.db)
+        # so a snapshot of some other database can never replace it
+        'enabled': True,
+        'directory': None,
+        'check_interval': 1.0,
+    },
+    'metrics': {
+        # Per-stage tap timings are kept for this long for the percentiles
+        'window_seconds': 300,
+        # Write a JSON snapshot here every file_interval_seconds (null disables)
+        'file': None,
+        'file_interval_seconds': 10,
+        # Serve /metrics and /metrics.json on host:port (null disables)
+        'host': '127.0.0.1',
+        'port': None,
+    },
+    'log_writer': {
+        'batch_size': 50,
+        'flush_interval_ms': 200,
+        'queue_size': 10000,
+        # A batch blocked by another writer is retried this many times before it is dropped
+        'retry_attempts': 5,
+        'retry_backoff_ms': 100,
+    },
+}
+
+
+def load_config(path=CONFIG_PATH):
+    config = {section: dict(values) for section, values in DEFAULTS.items()}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as file:
+            for section, values in json.load(file).items():
+                config.setdefault(section, {}).update(values)
+    return config
+
+
+CONFIG = load_config()
@@ -1,59 +1,111 @@
+import os
 import sqlite3
 import hashlib
+import re
 from datetime import datetime
+from card_cache import CardCache
+from config import CONFIG
+from log_writer import AccessLogWriter
+from log_archive import LogArchive, LogArchiver
+from schema import migrate
+from allowlist import Allowlist, publish_snapshot
+
+def open_connection(check_same_thread=True):
+    # Every connection in the app (GUI, log writer, archiver, exports) is opened
+    # here so they all share the same tuning.
+    settings = CONFIG['database']
+    conn = sqlite3.connect(settings['path'], timeout=settings['busy_timeout_ms'] / 1000.0,
+                           check_same_thread=check_same_thread)
+    conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(settings['cache_size_kb']) * -1}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size_mb']) * 1024 * 1024}")
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout_ms'])}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    return conn
+
+def allowlist_directory():
+    # Snapshots belong to one database file: by default they sit next to it
+    settings = CONFIG['allowlist']
+    return settings['directory'] or os.path.splitext(CONFIG['database']['path'])[0] + '_allowlist'
+
+def log_filter_clause(status=None, date_from=None, date_to=None, card_id=None, role=None):
+    # Dates are 'YYYY-MM-DD' and inclusive on both ends
+    conditions = []
+    params = []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if card_id:
+        conditions.append("card_id = ?")
+        params.append(card_id)
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    if date_from:
+        conditions.append("timestamp >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("timestamp < date(?, '+1 day')")
+        params.append(date_to)
+    return conditions, params
+
+def card_filter_clause(status, role=None, program=None):
+    # Cards a bulk status change to `status` would touch
+    conditions = ["status IS NOT ?"]
+    params = [status]
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    if program:
+        conditions.append("program = ?")
+        params.append(program)
+    return " AND ".join(conditions), params
 
 class DatabaseManager:
+    RANK_LIMIT = 5000
+    # Stays under SQLite's host-parameter limit in IN (...) lists
+    BULK_CHUNK = 500
+
     def __init__(self):
-        self.conn = sqlite3.connect('rfid_system.db')
-        self.create_tables()
+        # While the main window is open the connection is used only by its DatabaseWorker thread
+        self.conn = open_connection(check_same_thread=False)
+        migrate(self.conn)
+        self.fts_enabled = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'rfid_cards_fts'").fetchone() is not None
+        self.allowlist = None
+        settings = CONFIG['allowlist']
+        if settings['enabled']:
+            self.allowlist = Allowlist(allowlist_directory(), settings['check_interval'])
+        self.card_cache = CardCache(self.conn, allowlist=self.allowlist)
+        # Writes a snapshot only when none is published or it no longer matches rfid_cards
+        self.publish_allowlist()
+        self.log_writer = None
+        self.log_listeners = []
+        self.archive = LogArchive(CONFIG['archive']['directory'])
+        self.archiver = None
     
-    def create_tables(self):
+    def store_photo(self, data):
+        photo_hash = hashlib.sha256(data).hexdigest()
+        self.conn.execute("INSERT OR IGNORE INTO card_photos (hash, data, size) VALUES (?, ?, ?)",
+                          (photo_hash, data, len(data)))
+        return photo_hash
+
+    def get_photo(self, card_id):
         cursor = self.conn.cursor()
-        # Create admin table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS admin (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Create RFID cards table (updated with new fields)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS rfid_cards (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                card_id TEXT UNIQUE NOT NULL,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                role TEXT NOT NULL CHECK(role IN ('Student', 'Employee')),
-                school_id TEXT,
-                employee_id TEXT,
-                phone_number TEXT,
-                program TEXT NOT NULL,
-                photo BLOB,
-                status TEXT DEFAULT 'Active',
-                registered_by TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Create access log table
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS access_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                card_id TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                role TEXT NOT NULL,
-                status TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Create default admin if doesn't exist
-        cursor.execute("SELECT COUNT(*) FROM admin")
-        if cursor.fetchone()[0] == 0:
-            default_password = self.hash_password("admin123")
-            cursor.execute("INSERT INTO admin (username, password) VALUES (?, ?)", 
-                         ("admin", default_password))
-        self.conn.commit()
+            SELECT card_photos.data FROM rfid_cards
+            JOIN card_photos ON card_photos.hash = rfid_cards.photo
+            WHERE rfid_cards.card_id = ?
+        ''', (card_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def delete_unused_photo(self, photo_hash):
+        self.conn.execute('''
+            DELETE FROM card_photos
+            WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM rfid_cards WHERE photo = ?)
+        ''', (photo_hash, photo_hash))
     
     def hash_password(self, password):
         return hashlib.sha256(password.encode()).hexdigest()
@@ -66,50 +118,318 @@ class DatabaseManager:
         return cursor.fetchone() is not None
     
     def add_rfid_card(self, card_data):
-        cursor = self.conn.cursor()
+        # card_data[8] is the raw image bytes (or None); the row stores only its hash
+        photo = card_data[8]
         try:
-            cursor.execute('''
-                INSERT INTO rfid_cards (card_id, first_name, last_name, role, school_id, 
-                                      employee_id, phone_number, program, photo, registered_by) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', card_data)
-            self.conn.commit()
-            return True
+            # Any failure (a duplicate card, or SQLITE_BUSY behind an import) rolls the
+            # photo back too, so the shared connection is never left in a transaction
+            with self.conn:
+                if photo:
+                    card_data = card_data[:8] + (self.store_photo(photo),) + card_data[9:]
+                self.conn.execute('''
+                    INSERT INTO rfid_cards (card_id, first_name, last_name, role, school_id, 
+                                          employee_id, phone_number, program, photo, registered_by) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', card_data)
         except sqlite3.IntegrityError:
             return False
+        self.publish_allowlist(lambda: self.card_cache.put(card_data[0], card_data[1], card_data[2], card_data[3]))
+        return True
     
     def get_all_cards(self):
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM rfid_cards ORDER BY created_at DESC")
         return cursor.fetchall()
     
+    def get_cards_page(self, after=None, limit=200, search='', offset=0):
+        # Keyset pagination on (created_at, id) so deep pages cost the same as the first
+        query = '''
+            SELECT id, card_id, first_name, last_name, role, school_id, employee_id,
+                   phone_number, program, status, registered_by, created_at
+            FROM rfid_cards
+        '''
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        if search:
+            pattern = f"%{search}%"
+            conditions.append('''(card_id LIKE ? OR first_name || ' ' || last_name LIKE ? OR school_id LIKE ?
+                                  OR employee_id LIKE ? OR phone_number LIKE ? OR program LIKE ?)''')
+            params.extend([pattern] * 6)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+    def search_cards(self, text, offset=0, limit=200):
+        # Every word is a prefix term and all must match, best bm25 rank first
+        terms = re.findall(r'\w+', text)
+        if not terms:
+            return self.get_cards_page(None, limit) if offset == 0 else []
+        if not self.fts_enabled:
+            return self.get_cards_page(None, limit, text, offset)
+        query = ' '.join(f'"{term}"*' for term in terms)
+        cursor = self.conn.cursor()
+        # Ranking a very broad prefix ("b", "09") means scoring most of the roster,
+        # so past RANK_LIMIT matches fall back to newest-first ordering
+        cursor.execute('''
+            SELECT count(*) FROM (SELECT rowid FROM rfid_cards_fts WHERE rfid_cards_fts MATCH ? LIMIT ?)
+        ''', (query, self.RANK_LIMIT))
+        broad = cursor.fetchone()[0] >= self.RANK_LIMIT
+        order = 'rfid_cards_fts.rowid DESC' if broad else 'rfid_cards_fts.rank'
+        cursor.execute(f'''
+            SELECT c.id, c.card_id, c.first_name, c.last_name, c.role, c.school_id, c.employee_id,
+                   c.phone_number, c.program, c.status, c.registered_by, c.created_at
+            FROM rfid_cards_fts
+            JOIN rfid_cards c ON c.id = rfid_cards_fts.rowid
+            WHERE rfid_cards_fts MATCH ?
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        ''', (query, limit, offset))
+        return cursor.fetchall()
+
     def update_card_status(self, card_id, status):
+        self.update_cards_status([card_id], status)
+
+    def update_cards_status(self, card_ids, status):
+        # One transaction for the whole selection; returns the card_ids that changed
+        card_ids = list(card_ids)
+        changed = []
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(card_ids), self.BULK_CHUNK):
+                chunk = card_ids[start:start + self.BULK_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                changed.extend(row[0] for row in self.conn.execute(
+                    f"SELECT card_id FROM rfid_cards WHERE card_id IN ({marks}) AND status IS NOT ?",
+                    chunk + [status]))
+                self.conn.execute(
+                    f"UPDATE rfid_cards SET status = ? WHERE card_id IN ({marks}) AND status IS NOT ?",
+                    [status] + chunk + [status])
+        if changed:
+            self.publish_allowlist(lambda: self.set_cached_status(changed, status))
+        return changed
+
+    def update_status_by_filter(self, status, role=None, program=None):
+        where, params = card_filter_clause(status, role, program)
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            changed = [row[0] for row in self.conn.execute(f"SELECT card_id FROM rfid_cards WHERE {where}", params)]
+            self.conn.execute(f"UPDATE rfid_cards SET status = ? WHERE {where}", [status] + params)
+        if changed:
+            self.publish_allowlist(lambda: self.set_cached_status(changed, status))
+        return changed
+
+    def set_cached_status(self, card_ids, status):
+        for card_id in card_ids:
+            self.card_cache.set_status(card_id, status)
+
+    def remove_cached_cards(self, card_ids):
+        for card_id in card_ids:
+            self.card_cache.remove(card_id)
+
+    def count_cards_by_filter(self, status, role=None, program=None):
+        where, params = card_filter_clause(status, role, program)
         cursor = self.conn.cursor()
-        cursor.execute("UPDATE rfid_cards SET status = ? WHERE card_id = ?", 
-                      (status, card_id))
-        self.conn.commit()
+        cursor.execute(f"SELECT COUNT(*) FROM rfid_cards WHERE {where}", params)
+        return cursor.fetchone()[0]
+
+    def get_programs(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT DISTINCT program FROM rfid_cards ORDER BY program")
+        return [row[0] for row in cursor.fetchall()]
     
     def get_card_by_id(self, card_id):
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM rfid_cards WHERE card_id = ?", (card_id,))
         return cursor.fetchone()
+
+    def get_card_access(self, card_id):
+        return self.card_cache.get(card_id)
+
+    def lookup_card(self, card_id):
+        # (CardAccess or None, 'Active'/'Inactive'/None) for a gate decision
+        return self.card_cache.lookup(card_id)
     
-    def log_access(self, card_id, full_name, role, status):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO access_log (card_id, full_name, role, status, timestamp) 
-            VALUES (?, ?, ?, ?, ?)
-        ''', (card_id, full_name, role, status, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-        self.conn.commit()
+    def log_access(self, card_id, full_name, role, status, reader_id=None):
+        if self.log_writer is None:
+            settings = CONFIG['log_writer']
+            self.log_writer = AccessLogWriter(open_connection, settings['batch_size'],
+                                              settings['flush_interval_ms'], settings['queue_size'],
+                                              settings['retry_attempts'], settings['retry_backoff_ms'])
+            for callback in self.log_listeners:
+                self.log_writer.add_listener(callback)
+            self.log_writer.start()
+        self.log_writer.submit((card_id, full_name, role, status,
+                                datetime.now().strftime('%Y-%m-%d %H:%M:%S'), reader_id))
+
+    def add_log_listener(self, callback):
+        self.log_listeners.append(callback)
+        if self.log_writer is not None:
+            self.log_writer.add_listener(callback)
+
+    def flush_logs(self):
+        if self.log_writer is not None:
+            self.log_writer.flush()
+
+    def log_writer_stats(self):
+        return self.log_writer.stats() if self.log_writer is not None else {}
     
     def get_access_log(self, limit=50):
+        return self.query_access_log(limit=limit)
+
+    def load_access_log(self, limit=200, **filters):
+        # Newest rows plus the id new rows will be fetched after
+        rows = self.query_access_log(limit=limit, **filters)
+        return rows, max((row[0] for row in rows), default=self.last_access_log_id())
+
+    def last_access_log_id(self):
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM access_log ORDER BY timestamp DESC LIMIT ?", (limit,))
-        return cursor.fetchall()
+        cursor.execute("SELECT MAX(id) FROM access_log")
+        return cursor.fetchone()[0] or 0
+
+    def query_access_log(self, status=None, date_from=None, date_to=None, card_id=None, role=None,
+                         before=None, after_id=None, limit=200):
+        # Newest first. before=(timestamp, id) of the last row seen fetches the next
+        # older page; after_id fetches only rows logged since that id.
+        conditions, params = log_filter_clause(status, date_from, date_to, card_id, role)
+        if before is not None:
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend(before)
+        if after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+        query = "SELECT * FROM access_log"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        cursor = self.conn.cursor()
+        cursor.execute(query, params + [limit])
+        rows = cursor.fetchall()
+        if after_id is None:
+            # Older pages and date ranges may reach into the monthly archives
+            rows = self.archive.extend_query(rows, conditions, params, limit, date_from, date_to, before)
+        return rows
 
     def delete_card(self, card_id):
+        self.delete_cards([card_id])
+
+    def delete_cards(self, card_ids):
+        card_ids = list(card_ids)
+        deleted = []
+        photos = set()
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(card_ids), self.BULK_CHUNK):
+                chunk = card_ids[start:start + self.BULK_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                for card_id, photo in self.conn.execute(
+                        f"SELECT card_id, photo FROM rfid_cards WHERE card_id IN ({marks})", chunk):
+                    deleted.append(card_id)
+                    if photo:
+                        photos.add(photo)
+                self.conn.execute(f"DELETE FROM rfid_cards WHERE card_id IN ({marks})", chunk)
+            # Photos shared with cards that remain are kept
+            for photo_hash in photos:
+                self.delete_unused_photo(photo_hash)
+        if deleted:
+            self.publish_allowlist(lambda: self.remove_cached_cards(deleted))
+        return deleted
+
+    def publish_allowlist(self, update_cache=None):
+        # update_cache applies the same change to the card cache; it runs together
+        # with mapping the new snapshot, so this process sees both at once
+        if self.allowlist is not None:
+            try:
+                publish_snapshot(self.conn, self.allowlist.directory)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Allowlist publish error: {e}")
+        with self.card_cache.lock:
+            if update_cache is not None:
+                update_cache()
+            if self.allowlist is not None:
+                self.allowlist.refresh(force=True)
+
+    def get_daily_totals(self, day):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT status, SUM(count) FROM access_stats_daily WHERE day = ? GROUP BY status
+        ''', (day,))
+        return dict(cursor.fetchall())
+
+    def get_hourly_stats(self, day):
+        # {hour: {status: count}} for 'YYYY-MM-DD'
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT substr(hour, 12, 2), status, SUM(count) FROM access_stats_hourly
+            WHERE hour >= ? AND hour < date(?, '+1 day') GROUP BY 1, 2
+        ''', (day, day))
+        stats = {}
+        for hour, status, count in cursor.fetchall():
+            stats.setdefault(int(hour), {})[status] = count
+        return stats
+
+    def get_dashboard_stats(self, day, date_from):
+        return self.get_daily_totals(day), self.get_hourly_stats(day), self.get_program_stats(date_from, day)
+
+    def get_program_stats(self, date_from, date_to, status='ACCESS_GRANTED'):
         cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM rfid_cards WHERE card_id = ?", (card_id,))
-        self.conn.commit()
+        cursor.execute('''
+            SELECT program, role, SUM(count) FROM access_stats_daily
+            WHERE day BETWEEN ? AND ? AND status = ?
+            GROUP BY program, role ORDER BY SUM(count) DESC
+        ''', (date_from, date_to, status))
+        return cursor.fetchall()
+
+    def start_archiver(self):
+        settings = CONFIG['archive']
+        if settings['enabled'] and self.archiver is None:
+            self.archiver = LogArchiver(self.archive, open_connection, settings['retain_days'],
+                                        settings['batch_size'], settings['pause_ms'], settings['interval_seconds'])
+            self.archiver.start()
+
+    def remove_log_listener(self, callback):
+        if callback in self.log_listeners:
+            self.log_listeners.remove(callback)
+        if self.log_writer is not None and callback in self.log_writer.listeners:
+            self.log_writer.listeners.remove(callback)
+
+    def stop_background(self):
+        # Flushes pending log rows and stops the worker threads; the connection stays open
+        if self.archiver is not None:
+            self.archiver.stop()
+            self.archiver = None
+        if self.log_writer is not None:
+            self.log_writer.close()
+            self.log_writer = None
+
+    def close(self):
+        self.stop_background()
+        if self.allowlist is not None:
+            self.allowlist.close()
+        self.conn.close()
+
+    # ... (rest of the DatabaseManager methods) ...
+
+
+_shared = None
+
+def shared_database():
+    # The GUI's windows share one DatabaseManager, so logging out and back in
+    # neither reopens the connection nor re-checks the schema.
+    global _shared
+    if _shared is None:
+        _shared = DatabaseManager()
+    return _shared
+
+def close_shared_database():
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
 
-    # ... (rest of the DatabaseManager methods) ... 
\ No newline at end of file
@@ -0,0 +1,109 @@
+import queue
+import threading
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, pyqtSignal
+
+_STOP = object()
+
+
+class DatabaseRequest:
+    def __init__(self, method, args, kwargs, key):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.future = Future()
+        self.callbacks = []
+        self.errbacks = []
+
+
+# Runs DatabaseManager methods on one thread that owns the connection, so the
+# GUI thread never waits on SQLite. call() queues a method by name and returns
+# a Future; callbacks run on the GUI thread once the result is in. A call made
+# with a key replaces a still-queued call with the same key (newest arguments
+# win, every caller's callback gets the one result), so a burst of refreshes
+# costs a single query. The worker also runs the card cache's version check,
+# which would otherwise query SQLite on the tap path.
+class AsyncDatabase(QObject):
+    completed = pyqtSignal(object)
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.queued = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.closed = False
+        self.completed.connect(self.on_completed)
+        self.db.card_cache.check_on_get = False
+        self.thread = threading.Thread(target=self.run, name='DatabaseWorker', daemon=True)
+        self.thread.start()
+
+    def call(self, method, *args, callback=None, errback=None, key=None, **kwargs):
+        with self.lock:
+            self.requests += 1
+            request = self.queued.get(key) if key is not None else None
+            if request is not None:
+                request.method, request.args, request.kwargs = method, args, kwargs
+                self.coalesced += 1
+            else:
+                request = DatabaseRequest(method, args, kwargs, key)
+                if key is not None:
+                    self.queued[key] = request
+                self.queue.put(request)
+            if callback is not None:
+                request.callbacks.append(callback)
+            if errback is not None:
+                request.errbacks.append(errback)
+        return request.future
+
+    def run(self):
+        cache = self.db.card_cache
+        while True:
+            try:
+                request = self.queue.get(timeout=cache.check_interval)
+            except queue.Empty:
+                request = None
+            try:
+                cache.check_version()
+            except Exception as e:
+                print(f"Card cache check error: {e}")
+            if request is _STOP:
+                break
+            if request is None:
+                continue
+            with self.lock:
+                if request.key is not None and self.queued.get(request.key) is request:
+                    del self.queued[request.key]
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = getattr(self.db, request.method)(*request.args, **request.kwargs)
+            except Exception as e:
+                print(f"Database error in {request.method}: {e}")
+                request.future.set_exception(e)
+            else:
+                request.future.set_result(result)
+            # Queued across to the GUI thread
+            self.completed.emit(request)
+
+    def on_completed(self, request):
+        if self.closed:
+            return
+        error = request.future.exception()
+        for callback in request.errbacks if error else request.callbacks:
+            callback(error if error else request.future.result())
+
+    def stats(self):
+        return {'requests': self.requests, 'coalesced': self.coalesced, 'queued': self.queue.qsize()}
+
+    def stop(self):
+        # Requests already queued still run (pending writes are not lost); their callbacks don't
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.db.card_cache.check_on_get = True
@@ -0,0 +1,120 @@
+import json
+import queue
+import socket
+import threading
+import time
+
+
+# Broadcasts gate events to local subscribers as JSON lines. Sending happens on
+# a dedicated thread so a slow or stuck subscriber never delays a decision.
+class EventServer:
+    def __init__(self, host='127.0.0.1', port=8765, queue_size=1000):
+        self.host = host
+        self.port = port
+        self.events = queue.Queue(maxsize=queue_size)
+        self.clients = []
+        self.clients_lock = threading.Lock()
+        self.dropped = 0
+        self.running = False
+        self.server_socket = None
+
+    def start(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen()
+        self.running = True
+        threading.Thread(target=self.accept_loop, name='EventServerAccept', daemon=True).start()
+        threading.Thread(target=self.send_loop, name='EventServerSend', daemon=True).start()
+
+    def accept_loop(self):
+        while self.running:
+            try:
+                client, _ = self.server_socket.accept()
+            except OSError:
+                break
+            client.settimeout(1.0)
+            with self.clients_lock:
+                self.clients.append(client)
+
+    def send_loop(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            data = (json.dumps(event) + '\n').encode('utf-8')
+            with self.clients_lock:
+                clients = list(self.clients)
+            for client in clients:
+                try:
+                    client.sendall(data)
+                except OSError:
+                    self.remove_client(client)
+
+    def remove_client(self, client):
+        with self.clients_lock:
+            if client in self.clients:
+                self.clients.remove(client)
+        client.close()
+
+    def publish(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.running = False
+        if self.server_socket is not None:
+            self.server_socket.close()
+        self.events.put(None)
+        with self.clients_lock:
+            for client in self.clients:
+                client.close()
+            self.clients = []
+
+
+class EventClient:
+    def __init__(self, host='127.0.0.1', port=8765, on_event=None, on_status=None, reconnect_interval=2.0):
+        self.host = host
+        self.port = port
+        self.on_event = on_event
+        self.on_status = on_status
+        self.reconnect_interval = reconnect_interval
+        self.running = False
+        self.sock = None
+
+    def run(self):
+        self.running = True
+        while self.running:
+            try:
+                self.sock = socket.create_connection((self.host, self.port), timeout=self.reconnect_interval)
+            except OSError:
+                time.sleep(self.reconnect_interval)
+                continue
+            self.sock.settimeout(None)
+            if self.on_status:
+                self.on_status(True)
+            try:
+                for line in self.sock.makefile('r', encoding='utf-8'):
+                    if line.strip():
+                        self.on_event(json.loads(line))
+            except (OSError, ValueError) as e:
+                if self.running:
+                    print(f"Gate event connection error: {e}")
+            finally:
+                self.sock.close()
+                self.sock = None
+            if self.on_status:
+                self.on_status(False)
+            if self.running:
+                time.sleep(self.reconnect_interval)
+
+    def stop(self):
+        self.running = False
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
@@ -0,0 +1,73 @@
+import argparse
+import signal
+from access_control import AccessController
+from config import CONFIG
+from database import DatabaseManager
+from event_bus import EventServer
+from serial_mux import SerialMux
+from tap_filter import TapFilter
+from tap_metrics import TapMetrics, TapTrace, start_exporters, stop_exporters
+
+RELAY_COMMANDS = {
+    'ACCESS_GRANTED': b'GRANT\n',
+    'ACCESS_DENIED': b'DENY\n',
+    'UNKNOWN_CARD': b'DENY\n',
+}
+
+
+def main():
+    gate = CONFIG['gate']
+    parser = argparse.ArgumentParser(description='Headless RFID gate: serial ingest, access decisions and logging.')
+    parser.add_argument('--host', default=gate['host'], help='address the event socket listens on')
+    parser.add_argument('--port', type=int, default=gate['port'], help='port the event socket listens on')
+    parser.add_argument('--relay', action='store_true', default=gate['relay_feedback'],
+                        help='send GRANT/DENY back to the reader so it can drive a relay or buzzer')
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    controller = AccessController(db)
+    events = EventServer(args.host, args.port)
+    tap_filter = TapFilter(CONFIG['tap_filter']['dedup_seconds'])
+    db.add_log_listener(lambda: events.publish({'type': 'logs_flushed'}))
+    metrics = TapMetrics(CONFIG['metrics']['window_seconds'])
+
+    def on_line(reader_id, line):
+        trace = TapTrace(mux.line_arrived)
+        trace.mark('read')
+        if not tap_filter.accept(reader_id, line):
+            return
+        trace.mark('validate')
+        decision = controller.decide(line.upper(), reader_id, trace)
+        if decision is None:
+            return
+        if args.relay:
+            mux.send(reader_id, RELAY_COMMANDS[decision.status])
+        metrics.record(trace)
+        event = decision._asdict()
+        event['type'] = 'decision'
+        events.publish(event)
+
+    def on_status(reader_id, connected):
+        print(f"Reader {reader_id}: {'connected' if connected else 'disconnected'}")
+        events.publish({'type': 'reader_status', 'reader_id': reader_id, 'connected': connected})
+
+    settings = CONFIG['serial']
+    mux = SerialMux(settings['readers'], on_line, on_status,
+                    settings['reconnect_interval'], settings['poll_interval_ms'])
+    signal.signal(signal.SIGINT, lambda *_: mux.stop())
+    signal.signal(signal.SIGTERM, lambda *_: mux.stop())
+
+    events.start()
+    exporters = start_exporters(metrics, CONFIG['metrics'])
+    db.start_archiver()
+    print(f"Gate daemon serving {len(mux.ports)} reader(s), events on {args.host}:{args.port}")
+    try:
+        mux.run()
+    finally:
+        stop_exporters(exporters)
+        events.close()
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+import heapq
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+ARCHIVE_FILE = re.compile(r'access_log_(\d{4})_(\d{2})\.db$')
+
+ARCHIVE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {schema}.access_log (
+        id INTEGER PRIMARY KEY,
+        card_id TEXT NOT NULL,
+        full_name TEXT NOT NULL,
+        role TEXT NOT NULL,
+        status TEXT NOT NULL,
+        timestamp TIMESTAMP,
+        reader_id TEXT
+    )
+'''
+ARCHIVE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_access_log_timestamp ON access_log (timestamp)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_access_log_status ON access_log (status, timestamp)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_access_log_card ON access_log (card_id, timestamp)",
+]
+LOG_COLUMNS = "id, card_id, full_name, role, status, timestamp, reader_id"
+
+
+def month_start(month):
+    return f"{month[0]:04d}-{month[1]:02d}-01"
+
+
+def next_month_start(month):
+    year, number = month
+    return month_start((year + 1, 1) if number == 12 else (year, number + 1))
+
+
+def row_key(row):
+    return (row[5], row[0])
+
+
+# access_log rows older than the retention window live in one SQLite file per
+# month (archive/access_log_YYYY_MM.db) with the same columns and ids, so the
+# hot table stays small. Reads merge the hot table with whichever monthly
+# files the requested range touches.
+class LogArchive:
+    def __init__(self, directory='archive'):
+        self.directory = directory
+
+    def path(self, month):
+        return os.path.join(self.directory, f'access_log_{month[0]:04d}_{month[1]:02d}.db')
+
+    def months(self, date_from=None, date_to=None):
+        if not os.path.isdir(self.directory):
+            return []
+        months = []
+        for name in os.listdir(self.directory):
+            match = ARCHIVE_FILE.match(name)
+            if not match:
+                continue
+            month = (int(match.group(1)), int(match.group(2)))
+            if date_from and next_month_start(month) <= date_from:
+                continue
+            if date_to and month_start(month) > date_to:
+                continue
+            months.append(month)
+        return sorted(months, reverse=True)
+
+    def open_month(self, month):
+        # Reads never attach to the caller's connection, whose transaction state is not ours
+        return sqlite3.connect(f"file:{self.path(month)}?mode=ro", uri=True)
+
+    def extend_query(self, rows, conditions, params, limit, date_from=None, date_to=None, before=None):
+        # rows holds up to `limit` rows from the hot table, newest first. Monthly
+        # files are visited newest first until none can reach the first `limit`.
+        upper = before[0] if before else date_to
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        query = f"SELECT {LOG_COLUMNS} FROM access_log{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        for month in self.months(date_from, upper):
+            if len(rows) >= limit and rows[limit - 1][5] >= next_month_start(month):
+                break
+            with closing(self.open_month(month)) as source:
+                rows = rows + source.execute(query, params + [limit]).fetchall()
+            rows = heapq.nlargest(limit, rows, key=row_key)
+        return rows
+
+    def iter_sources(self, conn, conditions, params, batch_size=5000, date_from=None, date_to=None):
+        # One newest-first row stream per source (hot table + each relevant month),
+        # merged into a single newest-first stream without loading any of them.
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        query = f"SELECT {LOG_COLUMNS} FROM access_log{where} ORDER BY timestamp DESC, id DESC"
+        sources = [conn]
+        for month in self.months(date_from, date_to):
+            sources.append(self.open_month(month))
+        try:
+            streams = [self.stream(source.execute(query, params), batch_size) for source in sources]
+            yield from heapq.merge(*streams, key=row_key, reverse=True)
+        finally:
+            for source in sources[1:]:
+                source.close()
+
+    def stream(self, cursor, batch_size):
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def count(self, conditions, params, date_from=None, date_to=None):
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        total = 0
+        for month in self.months(date_from, date_to):
+            with closing(self.open_month(month)) as source:
+                total += source.execute(f"SELECT COUNT(*) FROM access_log{where}", params).fetchone()[0]
+        return total
+
+    def archive_batch(self, conn, cutoff, batch_size=500):
+        # Moves up to batch_size rows older than cutoff; returns how many moved.
+        rows = conn.execute(
+            "SELECT id, timestamp FROM access_log WHERE timestamp < ? ORDER BY timestamp LIMIT ?",
+            (cutoff, batch_size)).fetchall()
+        by_month = {}
+        for row_id, timestamp in rows:
+            by_month.setdefault((int(timestamp[:4]), int(timestamp[5:7])), []).append(row_id)
+        os.makedirs(self.directory, exist_ok=True)
+        for month, ids in by_month.items():
+            conn.execute("ATTACH DATABASE ? AS archive", (self.path(month),))
+            try:
+                marks = ','.join('?' * len(ids))
+                # In WAL mode a commit spanning attached databases is not atomic, so the
+                # copy is committed on its own before anything is deleted from main.
+                # OR IGNORE keeps a retried batch from failing on rows already copied.
+                with conn:
+                    conn.execute(ARCHIVE_SCHEMA.format(schema='archive'))
+                    for statement in ARCHIVE_INDEXES:
+                        conn.execute(statement.format(schema='archive'))
+                    conn.execute(f'''
+                        INSERT OR IGNORE INTO archive.access_log ({LOG_COLUMNS})
+                        SELECT {LOG_COLUMNS} FROM main.access_log WHERE id IN ({marks})
+                    ''', ids)
+                with conn:
+                    # Only rows the archive now holds are removed
+                    conn.execute(f'''
+                        DELETE FROM main.access_log WHERE id IN ({marks})
+                        AND id IN (SELECT id FROM archive.access_log WHERE id IN ({marks}))
+                    ''', ids + ids)
+            finally:
+                conn.execute("DETACH DATABASE archive")
+        return len(rows)
+
+
+class LogArchiver(threading.Thread):
+    def __init__(self, archive, connect, retain_days=180, batch_size=500, pause_ms=50, interval_seconds=3600):
+        super().__init__(name='LogArchiver', daemon=True)
+        self.archive = archive
+        self.connect = connect
+        self.retain_days = retain_days
+        self.batch_size = batch_size
+        self.pause = pause_ms / 1000.0
+        self.interval = interval_seconds
+        self.stop_event = threading.Event()
+        self.rows_archived = 0
+
+    def run(self):
+        conn = self.connect()
+        try:
+            while not self.stop_event.is_set():
+                self.archive_old_rows(conn)
+                self.stop_event.wait(self.interval)
+        finally:
+            conn.close()
+
+    def archive_old_rows(self, conn):
+        cutoff = (datetime.now() - timedelta(days=self.retain_days)).strftime('%Y-%m-%d %H:%M:%S')
+        while not self.stop_event.is_set():
+            try:
+                moved = self.archive.archive_batch(conn, cutoff, self.batch_size)
+            except sqlite3.OperationalError as e:
+                print(f"Access log archiving error: {e}")
+                return
+            self.rows_archived += moved
+            if moved < self.batch_size:
+                return
+            # Small batches with a pause in between so log writes are never starved
+            time.sleep(self.pause)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
@@ -0,0 +1,69 @@
+import csv
+import gzip
+import os
+from config import CONFIG
+from database import open_connection, log_filter_clause
+from log_archive import LogArchive
+
+EXPORT_HEADER = ['Card ID', 'Full Name', 'Role', 'Status', 'Timestamp', 'Reader']
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def count_access_log(conn, archive, filters):
+    conditions, params = log_filter_clause(**filters)
+    query = "SELECT COUNT(*) FROM access_log"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    total = conn.execute(query, params).fetchone()[0]
+    return total + archive.count(conditions, params, filters.get('date_from'), filters.get('date_to'))
+
+
+def iter_access_log(conn, archive, filters, batch_size=5000):
+    # Hot table and monthly archives merged newest first, batch_size rows at a time
+    conditions, params = log_filter_clause(**filters)
+    rows = archive.iter_sources(conn, conditions, params, batch_size,
+                                filters.get('date_from'), filters.get('date_to'))
+    batch = []
+    for row in rows:
+        batch.append(row[1:])
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def open_export_file(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def export_access_log(path, filters=None, progress=None, is_cancelled=None, batch_size=5000):
+    # Streams rows from a private connection, so memory stays flat and it is
+    # safe to call from a worker thread. Returns the number of rows written.
+    filters = filters or {}
+    conn = open_connection()
+    archive = LogArchive(CONFIG['archive']['directory'])
+    written = 0
+    try:
+        total = count_access_log(conn, archive, filters)
+        with open_export_file(path) as file:
+            writer = csv.writer(file, quoting=csv.QUOTE_ALL)
+            writer.writerow(EXPORT_HEADER)
+            for rows in iter_access_log(conn, archive, filters, batch_size):
+                if is_cancelled and is_cancelled():
+                    raise ExportCancelled()
+                writer.writerows(row[:5] + (row[5] or '',) for row in rows)
+                written += len(rows)
+                if progress:
+                    progress(written, total)
+    except ExportCancelled:
+        os.remove(path)
+        raise
+    finally:
+        conn.close()
+    return written
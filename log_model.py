@@ -0,0 +1,131 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+STATUS_COLORS = {
+    'ACCESS_GRANTED': (QColor('#d4edda'), QColor('#155724')),
+    'ACCESS_DENIED': (QColor('#f8d7da'), QColor('#721c24')),
+}
+OTHER_STATUS_COLORS = (QColor('#fff3cd'), QColor('#856404'))
+
+STATUS_COLUMN = 3
+
+
+class AccessLogModel(QAbstractTableModel):
+    headers = ['Card ID', 'Full Name', 'Role', 'Status', 'Timestamp', 'Reader']
+
+    def __init__(self, db, max_rows=200):
+        super().__init__()
+        # db is an AsyncDatabase; rows arrive through callbacks
+        self.db = db
+        self.max_rows = max_rows
+        # Grows as older pages are fetched on scroll; refresh trims back to it
+        self.row_limit = max_rows
+        self.filters = {}
+        self.rows = []
+        self.exhausted = False
+        # Highest access_log.id already shown; only rows above it are fetched on refresh
+        self.last_id = 0
+        # One request in flight at a time; refreshes asked for meanwhile collapse into one
+        self.loading = False
+        self.refresh_pending = False
+        self.generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        log = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return log[column + 1] or ''
+        if column == STATUS_COLUMN and role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            background, foreground = STATUS_COLORS.get(log[4], OTHER_STATUS_COLORS)
+            return background if role == Qt.BackgroundRole else foreground
+        return None
+
+    def set_filters(self, **filters):
+        self.filters = {key: value for key, value in filters.items() if value}
+        self.reload()
+
+    def request(self, method, on_result, *args, **kwargs):
+        self.loading = True
+        generation = self.generation
+        self.db.call(method, *args, **kwargs,
+                     callback=lambda result: self.on_result(generation, on_result, result),
+                     errback=lambda error: self.on_result(generation, None, None))
+
+    def on_result(self, generation, on_result, result):
+        # Results of requests made before the last reload are dropped
+        if generation != self.generation:
+            return
+        self.loading = False
+        if on_result is not None:
+            on_result(result)
+        if self.refresh_pending and not self.loading:
+            self.refresh_pending = False
+            self.refresh()
+
+    def reload(self):
+        self.generation += 1
+        self.refresh_pending = False
+        self.request('load_access_log', self.show_rows, limit=self.max_rows, **self.filters)
+
+    def show_rows(self, result):
+        rows, last_id = result
+        self.beginResetModel()
+        self.row_limit = self.max_rows
+        self.rows = rows
+        self.exhausted = len(self.rows) < self.max_rows
+        self.last_id = last_id
+        self.endResetModel()
+
+    def refresh(self):
+        if self.loading:
+            self.refresh_pending = True
+            return
+        self.request('query_access_log', self.add_new_rows,
+                     after_id=self.last_id, limit=self.max_rows + 1, **self.filters)
+
+    def add_new_rows(self, new_rows):
+        if not new_rows:
+            return
+        if len(new_rows) > self.max_rows:
+            self.reload()
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(new_rows) - 1)
+        self.rows[0:0] = new_rows
+        self.last_id = max(self.last_id, max(row[0] for row in new_rows))
+        self.endInsertRows()
+        if len(self.rows) > self.row_limit:
+            self.beginRemoveRows(QModelIndex(), self.row_limit, len(self.rows) - 1)
+            del self.rows[self.row_limit:]
+            self.endRemoveRows()
+            self.exhausted = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.loading and bool(self.rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.loading or not self.rows:
+            return
+        before = (self.rows[-1][5], self.rows[-1][0])
+        self.request('query_access_log', self.add_older_rows, before=before, limit=self.max_rows, **self.filters)
+
+    def add_older_rows(self, page):
+        if len(page) < self.max_rows:
+            self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.row_limit = len(self.rows)
+            self.endInsertRows()
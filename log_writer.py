@@ -0,0 +1,132 @@
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from access_stats import update_rollups
+
+_STOP = object()
+
+
+class AccessLogWriter(threading.Thread):
+    def __init__(self, connect, batch_size=50, flush_interval_ms=200, queue_size=10000,
+                 retry_attempts=5, retry_backoff_ms=100):
+        super().__init__(name='AccessLogWriter', daemon=True)
+        self.connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.listeners = []
+        self.events_written = 0
+        # A batch that hits a lock (busy_timeout ran out) is retried before newer
+        # rows are written, waiting retry_backoff_ms, then twice as long each time
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff_ms / 1000.0
+        self.events_dropped = 0
+        self.write_retries = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.flush_latencies = deque(maxlen=1000)
+        self.closed = False
+
+    def submit(self, row):
+        # Blocks when the queue is full so a stalled disk applies back-pressure
+        # instead of growing memory without bound.
+        self.queue.put(row)
+        depth = self.queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def flush(self, timeout=None):
+        if self.closed or not self.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout=None):
+        if self.closed:
+            return
+        self.closed = True
+        if self.is_alive():
+            self.queue.put(_STOP)
+            self.join(timeout)
+
+    def run(self):
+        conn = self.connect()
+        pending = []
+        deadline = None
+        try:
+            while True:
+                wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=wait)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    self.write_batch(conn, pending)
+                    break
+                if isinstance(item, threading.Event):
+                    self.write_batch(conn, pending)
+                    pending, deadline = [], None
+                    item.set()
+                    continue
+                if item is not None:
+                    pending.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                if len(pending) >= self.batch_size or (pending and time.monotonic() >= deadline):
+                    self.write_batch(conn, pending)
+                    pending, deadline = [], None
+        finally:
+            conn.close()
+
+    def write_batch(self, conn, rows):
+        if not rows:
+            return
+        started = time.perf_counter()
+        for attempt in range(1, self.retry_attempts + 1):
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT INTO access_log (card_id, full_name, role, status, timestamp, reader_id) 
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    update_rollups(conn, rows)
+                break
+            except sqlite3.OperationalError as e:
+                # Busy or locked: another connection holds the write lock for now
+                if attempt == self.retry_attempts:
+                    self.drop(rows, e)
+                    return
+                self.write_retries += 1
+                time.sleep(min(self.retry_backoff * 2 ** (attempt - 1), 2.0))
+            except sqlite3.Error as e:
+                self.drop(rows, e)
+                return
+        self.flush_latencies.append(time.perf_counter() - started)
+        self.events_written += len(rows)
+        self.batches += 1
+        for callback in self.listeners:
+            callback()
+
+    def drop(self, rows, error):
+        self.events_dropped += len(rows)
+        print(f"Access log write error, {len(rows)} events dropped: {error}")
+
+    def stats(self):
+        latencies = list(self.flush_latencies)
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'events_written': self.events_written,
+            'events_dropped': self.events_dropped,
+            'write_retries': self.write_retries,
+            'batches': self.batches,
+            'last_flush_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'avg_flush_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'max_flush_ms': max(latencies) * 1000 if latencies else 0.0,
+        }
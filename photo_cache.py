@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from photo_utils import decode_photo
+
+
+class DecodeTask(QRunnable):
+    def __init__(self, cache, card_id, photo_hash, data, size):
+        super().__init__()
+        self.cache = cache
+        self.card_id = card_id
+        self.photo_hash = photo_hash
+        self.data = data
+        self.size = size
+
+    def run(self):
+        image = decode_photo(self.data, self.size)
+        # Delivered to the cache on the GUI thread (queued connection)
+        self.cache.decoded.emit(self.card_id, self.photo_hash, image)
+
+
+# Ready-to-show pixmaps of card photos, most recently used kept, keyed by
+# card_id. Entries remember the photo hash they were made from, so a card
+# whose photo changed is decoded again. Decoding runs on a thread pool;
+# only the QImage -> QPixmap conversion happens on the GUI thread.
+class PhotoCache(QObject):
+    decoded = pyqtSignal(str, str, object)
+
+    def __init__(self, size=150, capacity=200, threads=2, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+        self.waiting = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self.hits = 0
+        self.misses = 0
+        self.decoded.connect(self.on_decoded)
+
+    def get(self, card_id, photo_hash):
+        entry = self.pixmaps.get(card_id)
+        if entry is None or entry[0] != photo_hash:
+            return None
+        self.pixmaps.move_to_end(card_id)
+        return entry[1]
+
+    def request(self, card_id, photo_hash, load_data, callback):
+        # callback(pixmap or None) runs on the GUI thread, at once on a hit.
+        # load_data(deliver) is only called on a miss; it fetches the stored
+        # photo bytes (usually through the database worker) and passes them to deliver.
+        pixmap = self.get(card_id, photo_hash)
+        if pixmap is not None:
+            self.hits += 1
+            callback(pixmap)
+            return
+        self.misses += 1
+        key = (card_id, photo_hash)
+        if key in self.waiting:
+            self.waiting[key].append(callback)
+            return
+        self.waiting[key] = [callback]
+        load_data(lambda data: self.decode(card_id, photo_hash, data))
+
+    def decode(self, card_id, photo_hash, data):
+        if not data:
+            self.on_decoded(card_id, photo_hash, None)
+            return
+        self.pool.start(DecodeTask(self, card_id, photo_hash, data, self.size))
+
+    def on_decoded(self, card_id, photo_hash, image):
+        callbacks = self.waiting.pop((card_id, photo_hash), [])
+        pixmap = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+            self.pixmaps[card_id] = (photo_hash, pixmap)
+            self.pixmaps.move_to_end(card_id)
+            while len(self.pixmaps) > self.capacity:
+                self.pixmaps.popitem(last=False)
+        for callback in callbacks:
+            callback(pixmap)
+
+    def remove(self, card_id):
+        self.pixmaps.pop(card_id, None)
+
+    def stats(self):
+        return {'entries': len(self.pixmaps), 'hits': self.hits, 'misses': self.misses}
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,45 @@
+from PyQt5.QtCore import Qt, QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QImage, QImageReader, QPainter
+
+# Stored photos are re-encoded to fit inside this box; the UI never shows them larger
+PHOTO_MAX_SIZE = 480
+PHOTO_QUALITY = 85
+
+
+def normalize_photo(data, max_size=PHOTO_MAX_SIZE, quality=PHOTO_QUALITY):
+    # Returns JPEG bytes no larger than max_size on either side, or None if the
+    # data is not a readable image. Uses QImage only, so it is safe off the GUI thread.
+    image = QImage()
+    if not image.loadFromData(data):
+        return None
+    if image.width() > max_size or image.height() > max_size:
+        image = image.scaled(max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if image.hasAlphaChannel():
+        # JPEG has no alpha; flatten onto white rather than letting it turn black
+        flattened = QImage(image.size(), QImage.Format_RGB32)
+        flattened.fill(Qt.white)
+        painter = QPainter(flattened)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        image = flattened
+    output = QByteArray()
+    buffer = QBuffer(output)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'JPEG', quality)
+    buffer.close()
+    return bytes(output)
+
+
+def decode_photo(data, size):
+    # QImage fitting inside a size x size box, or None. JPEGs are decoded
+    # straight to the smaller size rather than decoded in full and scaled.
+    buffer = QBuffer()
+    buffer.setData(data)
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    original = reader.size()
+    if original.isValid() and (original.width() > size or original.height() > size):
+        reader.setScaledSize(original.scaled(size, size, Qt.KeepAspectRatio))
+    image = reader.read()
+    buffer.close()
+    return None if image.isNull() else image
@@ -1,12 +1,22 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QIcon
-from ui_login import LoginWindow
+import startup_timing
 
 if __name__ == '__main__':
+    # --startup-timing prints import/DB open/first paint times; =FILE also appends them as JSON
+    for arg in sys.argv[1:]:
+        if arg == '--startup-timing' or arg.startswith('--startup-timing='):
+            startup_timing.enable(arg.partition('=')[2] or None)
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
     app = QApplication(sys.argv)
+    startup_timing.mark('qt ready')
+    # The UI and database modules are only imported once Qt is up
+    from ui_login import LoginWindow
+    from database import close_shared_database
+    startup_timing.mark('imports')
     app.setWindowIcon(QIcon('icon.ico'))
+    app.aboutToQuit.connect(close_shared_database)
     login_window = LoginWindow()
     login_window.setWindowIcon(QIcon('icon.ico'))
     login_window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -85,6 +85,9 @@ void setup() {
 }
 
 void loop() {
+  // Apply GRANT/DENY responses from the gate daemon (and the test commands)
+  handleSerialCommands();
+
   // Reset the loop if no new card present on the sensor/reader
   if (!mfrc522.PICC_IsNewCardPresent()) {
     return;
@@ -155,10 +158,25 @@ void cardDetectedFeedback() {
 // Function to handle serial commands from Python (optional)
 void handleSerialCommands() {
   if (Serial.available()) {
-    String command = Serial.readString();
+    String command = Serial.readStringUntil('\n');
     command.trim();
     
-    if (command == "STATUS") {
+    if (command == "GRANT") {
+      if (LED_GREEN > 0) {
+        digitalWrite(LED_GREEN, HIGH);
+        delay(500);
+        digitalWrite(LED_GREEN, LOW);
+      }
+    } else if (command == "DENY") {
+      if (BUZZER_PIN > 0) {
+        tone(BUZZER_PIN, 400, 300);
+      }
+      if (LED_RED > 0) {
+        digitalWrite(LED_RED, HIGH);
+        delay(500);
+        digitalWrite(LED_RED, LOW);
+      }
+    } else if (command == "STATUS") {
       Serial.println("RFID_READY");
     } else if (command == "RESET") {
       lastCardID = "";
@@ -0,0 +1,168 @@
+import base64
+import hashlib
+import sqlite3
+from access_stats import create_stats_tables, rebuild_rollups
+from config import CONFIG
+from log_archive import LogArchive
+
+
+def create_base_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS admin (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rfid_cards (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            card_id TEXT UNIQUE NOT NULL,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            role TEXT NOT NULL CHECK(role IN ('Student', 'Employee')),
+            school_id TEXT,
+            employee_id TEXT,
+            phone_number TEXT,
+            program TEXT NOT NULL,
+            photo BLOB, -- sha256 of the image in card_photos
+            status TEXT DEFAULT 'Active',
+            registered_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            card_id TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            role TEXT NOT NULL,
+            status TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rfid_cards_created ON rfid_cards (created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_access_log_timestamp ON access_log (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_access_log_status ON access_log (status, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_access_log_card ON access_log (card_id, timestamp)")
+    cursor.execute("SELECT COUNT(*) FROM admin")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("INSERT INTO admin (username, password) VALUES (?, ?)",
+                       ("admin", hashlib.sha256("admin123".encode()).hexdigest()))
+
+
+def add_reader_column(conn):
+    # Databases created before multi-reader support lack the reader column
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(access_log)")]
+    if 'reader_id' not in columns:
+        conn.execute("ALTER TABLE access_log ADD COLUMN reader_id TEXT")
+
+
+def move_photos_out_of_cards(conn):
+    # Photo bytes live in card_photos, content-addressed, so card rows stay small.
+    # Older databases kept the base64-encoded file inline in rfid_cards.photo.
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS card_photos (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            size INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rfid_cards_photo ON rfid_cards (photo)")
+    cursor.execute('''
+        SELECT id, photo FROM rfid_cards
+        WHERE photo IS NOT NULL AND (length(photo) != 64 OR photo GLOB '*[^0-9a-f]*')
+    ''')
+    rows = cursor.fetchall()
+    if not rows:
+        return
+    for row_id, photo in rows:
+        try:
+            data = base64.b64decode(photo, validate=True)
+        except ValueError:
+            data = photo if isinstance(photo, bytes) else photo.encode()
+        photo_hash = hashlib.sha256(data).hexdigest()
+        cursor.execute("INSERT OR IGNORE INTO card_photos (hash, data, size) VALUES (?, ?, ?)",
+                       (photo_hash, data, len(data)))
+        cursor.execute("UPDATE rfid_cards SET photo = ? WHERE id = ?", (photo_hash, row_id))
+    conn.commit()
+    # Give the space used by the inline copies back to the filesystem
+    conn.execute("VACUUM")
+
+
+def create_search_index(conn):
+    # Full-text index over the searchable card fields. Triggers keep it in
+    # step with every insert/update/delete on rfid_cards.
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS rfid_cards_fts USING fts5(
+                card_id, first_name, last_name, school_id, employee_id, phone_number, program,
+                content='rfid_cards', content_rowid='id', prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: searches fall back to LIKE scans
+        return
+    columns = "card_id, first_name, last_name, school_id, employee_id, phone_number, program"
+    new_values = "new.card_id, new.first_name, new.last_name, new.school_id, new.employee_id, new.phone_number, new.program"
+    old_values = "old.card_id, old.first_name, old.last_name, old.school_id, old.employee_id, old.phone_number, old.program"
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rfid_cards_fts_insert AFTER INSERT ON rfid_cards BEGIN
+            INSERT INTO rfid_cards_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rfid_cards_fts_delete AFTER DELETE ON rfid_cards BEGIN
+            INSERT INTO rfid_cards_fts (rfid_cards_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rfid_cards_fts_update
+        AFTER UPDATE OF {columns} ON rfid_cards BEGIN
+            INSERT INTO rfid_cards_fts (rfid_cards_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO rfid_cards_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+    cursor.execute("INSERT INTO rfid_cards_fts (rfid_cards_fts) VALUES ('rebuild')")
+
+
+def create_access_stats(conn):
+    create_stats_tables(conn)
+    conn.commit()
+    rebuild_rollups(conn, LogArchive(CONFIG['archive']['directory']))
+
+
+# Applied in order to bring a database up to SCHEMA_VERSION; PRAGMA user_version
+# records how many have run. Each one is safe to re-run, so databases created
+# before versioning (user_version 0) pass through all of them unharmed.
+# Append new migrations; never reorder or edit released ones.
+MIGRATIONS = [
+    create_base_tables,
+    add_reader_column,
+    move_photos_out_of_cards,
+    create_search_index,
+    create_access_stats,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    # Returns the migrations that ran; on a current database this is one PRAGMA read
+    version = schema_version(conn)
+    applied = []
+    for number, migration in enumerate(MIGRATIONS, 1):
+        if number <= version:
+            continue
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+        applied.append(migration.__name__)
+    return applied
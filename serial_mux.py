@@ -0,0 +1,177 @@
+import selectors
+import socket
+import time
+from collections import deque
+
+import serial
+
+
+class SerialPort:
+    def __init__(self, reader_id, port, baud_rate=9600):
+        self.reader_id = reader_id
+        self.port = port
+        self.baud_rate = baud_rate
+        self.connection = None
+        self.selectable = False
+        self.buffer = b''
+        self.next_attempt = 0.0
+        # Set once an open has failed, so a missing reader is reported once, not every retry
+        self.failing = False
+
+
+# Serves every configured reader from a single I/O loop. Ports that expose a
+# file descriptor (POSIX) are waited on with a selector, so the loop sleeps
+# until bytes arrive on any of them. Ports without one (Windows COM ports) are
+# checked from the same loop every poll_interval_ms.
+class SerialMux:
+    def __init__(self, readers, on_line, on_status=None, reconnect_interval=2.0, poll_interval_ms=20):
+        self.ports = [SerialPort(r['id'], r['port'], r.get('baud_rate', 9600)) for r in readers]
+        self.ports_by_id = {port.reader_id: port for port in self.ports}
+        self.on_line = on_line
+        self.on_status = on_status
+        self.reconnect_interval = reconnect_interval
+        self.poll_interval = poll_interval_ms / 1000.0
+        self.running = False
+        self.latencies = deque(maxlen=1000)
+        # When the bytes of the line being handed to on_line arrived (perf_counter)
+        self.line_arrived = 0.0
+        self.selector = selectors.DefaultSelector()
+        self.wake_reader, self.wake_writer = socket.socketpair()
+        self.wake_reader.setblocking(False)
+        self.selector.register(self.wake_reader, selectors.EVENT_READ, None)
+
+    def run(self):
+        self.running = True
+        try:
+            while self.running:
+                for key, _ in self.selector.select(self.next_timeout()):
+                    if key.data is None:
+                        self.drain_wakeups()
+                    else:
+                        self.read_port(key.data)
+                now = time.monotonic()
+                for port in self.ports:
+                    if port.connection is None:
+                        if now >= port.next_attempt:
+                            self.open_port(port)
+                    elif not port.selectable:
+                        self.read_port(port)
+        finally:
+            for port in self.ports:
+                if port.connection is not None:
+                    self.close_port(port)
+            self.selector.close()
+            self.wake_reader.close()
+            self.wake_writer.close()
+
+    def stop(self):
+        self.running = False
+        try:
+            self.wake_writer.send(b'\0')
+        except OSError:
+            pass
+
+    def send(self, reader_id, data):
+        port = self.ports_by_id.get(reader_id)
+        if port is None or port.connection is None:
+            return False
+        try:
+            port.connection.write(data)
+            return True
+        except (serial.SerialException, OSError) as e:
+            print(f"Serial write error on {reader_id}: {e}")
+            self.disconnect(port)
+            return False
+
+    def connected_count(self):
+        return sum(1 for port in self.ports if port.connection is not None)
+
+    def next_timeout(self):
+        timeout = None
+        now = time.monotonic()
+        for port in self.ports:
+            if port.connection is None:
+                wait = max(0.0, port.next_attempt - now)
+            elif not port.selectable:
+                wait = self.poll_interval
+            else:
+                continue
+            timeout = wait if timeout is None else min(timeout, wait)
+        return timeout
+
+    def drain_wakeups(self):
+        try:
+            while self.wake_reader.recv(512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def open_port(self, port):
+        try:
+            port.connection = serial.Serial(port.port, port.baud_rate, timeout=0)
+        except (serial.SerialException, OSError) as e:
+            if not port.failing:
+                print(f"Serial connection error on {port.reader_id} ({port.port}): {e}; retrying every {self.reconnect_interval:g}s")
+                port.failing = True
+            port.next_attempt = time.monotonic() + self.reconnect_interval
+            return
+        if port.failing:
+            print(f"Serial reader {port.reader_id} ({port.port}) connected")
+            port.failing = False
+        port.buffer = b''
+        try:
+            self.selector.register(port.connection, selectors.EVENT_READ, port)
+            port.selectable = True
+        except (AttributeError, ValueError, OSError):
+            port.selectable = False
+        if self.on_status:
+            self.on_status(port.reader_id, True)
+
+    def close_port(self, port):
+        if port.selectable:
+            self.selector.unregister(port.connection)
+        try:
+            port.connection.close()
+        except (serial.SerialException, OSError):
+            pass
+        port.connection = None
+        port.selectable = False
+
+    def disconnect(self, port):
+        self.close_port(port)
+        port.next_attempt = time.monotonic() + self.reconnect_interval
+        if self.on_status:
+            self.on_status(port.reader_id, False)
+
+    def read_port(self, port):
+        try:
+            waiting = port.connection.in_waiting
+            if not waiting and not port.selectable:
+                return
+            chunk = port.connection.read(max(1, waiting))
+        except (serial.SerialException, OSError) as e:
+            print(f"Serial read error on {port.reader_id}: {e}")
+            self.disconnect(port)
+            return
+        if not chunk:
+            return
+        arrived = time.perf_counter()
+        self.line_arrived = arrived
+        port.buffer += chunk
+        *lines, port.buffer = port.buffer.split(b'\n')
+        for line in lines:
+            text = line.decode('utf-8', errors='ignore').strip()
+            if text:
+                self.on_line(port.reader_id, text)
+                self.latencies.append(time.perf_counter() - arrived)
+
+    def latency_stats(self):
+        samples = sorted(self.latencies)
+        if not samples:
+            return {'count': 0}
+        return {
+            'count': len(samples),
+            'avg_ms': sum(samples) / len(samples) * 1000,
+            'p50_ms': samples[len(samples) // 2] * 1000,
+            'max_ms': samples[-1] * 1000,
+        }
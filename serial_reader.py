@@ -1,36 +1,54 @@
-import serial
-import time
 from PyQt5.QtCore import QThread, pyqtSignal
+from serial_mux import SerialMux
+from event_bus import EventClient
+from tap_filter import TapFilter
+from tap_metrics import TapTrace
 
 class SerialReader(QThread):
-    card_detected = pyqtSignal(str)
-    
-    def __init__(self, port='COM3', baud_rate=9600):
+    card_detected = pyqtSignal(str, str, object)
+    reader_status = pyqtSignal(str, bool)
+
+    def __init__(self, readers, reconnect_interval=2.0, poll_interval_ms=20, tap_filter=None):
         super().__init__()
-        self.port = port
-        self.baud_rate = baud_rate
-        self.running = False
-        self.serial_connection = None
-    
+        self.tap_filter = tap_filter or TapFilter()
+        self.mux = SerialMux(readers, self.on_line, self.reader_status.emit,
+                             reconnect_interval, poll_interval_ms)
+
+    def on_line(self, reader_id, line):
+        # Runs on the I/O thread: duplicates and control lines never reach the GUI
+        trace = TapTrace(self.mux.line_arrived)
+        trace.mark('read')
+        if self.tap_filter.accept(reader_id, line):
+            trace.mark('validate')
+            self.card_detected.emit(line.upper(), reader_id, trace)
+
     def run(self):
         try:
-            self.serial_connection = serial.Serial(self.port, self.baud_rate, timeout=1)
-            self.running = True
-            
-            while self.running:
-                if self.serial_connection.in_waiting > 0:
-                    card_id = self.serial_connection.readline().decode('utf-8').strip()
-                    if card_id and len(card_id) > 0:
-                        self.card_detected.emit(card_id)
-                time.sleep(0.1)
-                
-        except serial.SerialException as e:
-            print(f"Serial connection error: {e}")
+            self.mux.run()
         except Exception as e:
             print(f"Error in serial reader: {e}")
-    
+
+    def reader_count(self):
+        return len(self.mux.ports)
+
+    def latency_stats(self):
+        return self.mux.latency_stats()
+
+    def stop(self):
+        self.mux.stop()
+        self.wait()
+
+class GateEventReader(QThread):
+    gate_event = pyqtSignal(dict)
+    connection_status = pyqtSignal(bool)
+
+    def __init__(self, host='127.0.0.1', port=8765):
+        super().__init__()
+        self.client = EventClient(host, port, self.gate_event.emit, self.connection_status.emit)
+
+    def run(self):
+        self.client.run()
+
     def stop(self):
-        self.running = False
-        if self.serial_connection and self.serial_connection.is_open:
-            self.serial_connection.close()
-        self.wait() 
\ No newline at end of file
+        self.client.stop()
+        self.wait()
@@ -0,0 +1,57 @@
+import json
+import time
+from datetime import datetime
+
+# Set by rfid.py from --startup-timing[=FILE]; every call below is a no-op otherwise
+STARTED = time.perf_counter()
+enabled = False
+output_path = None
+marks = []
+
+
+def enable(path=None):
+    global enabled, output_path
+    enabled = True
+    output_path = path
+
+
+def mark(name):
+    if enabled:
+        marks.append((name, time.perf_counter() - STARTED))
+
+
+def watch_first_paint(widget, name, then=None):
+    # Marks `name` when the widget is painted for the first time, then calls `then`
+    if not enabled:
+        return
+    from PyQt5.QtCore import QObject, QEvent
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                mark(name)
+                if then is not None:
+                    then()
+            return False
+
+    widget.first_paint_filter = FirstPaint(widget)
+    widget.installEventFilter(widget.first_paint_filter)
+
+
+def report():
+    if not enabled or not marks:
+        return
+    print('Startup timing (ms since launch / since previous step):')
+    previous = 0.0
+    for name, seconds in marks:
+        print(f'  {name:<24} {seconds * 1000:8.1f} {(seconds - previous) * 1000:8.1f}')
+        previous = seconds
+    if output_path:
+        # One JSON line per launch, so runs can be compared across versions
+        with open(output_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'marks': {name: round(seconds * 1000, 1) for name, seconds in marks},
+            }) + '\n')
+    marks.clear()
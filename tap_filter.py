@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict, deque
+from access_control import UID_PATTERN
+
+
+class TapFilter:
+    def __init__(self, dedup_seconds=10.0, clock=time.monotonic):
+        self.dedup_seconds = dedup_seconds
+        self.clock = clock
+        # (reader_id, card_id) -> time last seen, oldest first, so expiry only
+        # ever looks at the front of the dict
+        self.recent = OrderedDict()
+        self.taps = 0
+        self.duplicates = 0
+        self.control_lines = 0
+        self.last_control_lines = deque(maxlen=20)
+
+    def accept(self, reader_id, line):
+        now = self.clock()
+        self.expire(now)
+        if not UID_PATTERN.fullmatch(line):
+            # Banners and command replies from the sketch ("RFID System Ready", "RESET_OK", ...)
+            self.control_lines += 1
+            self.last_control_lines.append((reader_id, line))
+            return False
+        key = (reader_id, line.upper())
+        if key in self.recent:
+            # A card held at the reader keeps sliding its own window forward
+            self.duplicates += 1
+            self.recent[key] = now
+            self.recent.move_to_end(key)
+            return False
+        self.recent[key] = now
+        self.taps += 1
+        return True
+
+    def expire(self, now):
+        cutoff = now - self.dedup_seconds
+        while self.recent:
+            key, seen = next(iter(self.recent.items()))
+            if seen > cutoff:
+                break
+            self.recent.popitem(last=False)
+
+    def stats(self):
+        return {
+            'taps': self.taps,
+            'duplicates': self.duplicates,
+            'control_lines': self.control_lines,
+            'tracked_cards': len(self.recent),
+        }
@@ -0,0 +1,203 @@
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stages a tap passes through, in order. Each is timed from the end of the one before it.
+STAGES = ['read', 'validate', 'queue', 'lookup', 'log_write', 'ui_update', 'display']
+
+# Histogram bucket upper bounds in milliseconds, roughly 25% apart from 10 µs to 30 s
+BUCKETS_MS = [round(0.01 * 1.25 ** i, 4) for i in range(68)]
+
+
+class TapTrace:
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter()))
+
+    def durations(self):
+        previous = self.started
+        for stage, at in self.marks:
+            yield stage, at - previous
+            previous = at
+
+    def total(self):
+        return self.marks[-1][1] - self.started if self.marks else 0.0
+
+
+# Bucket counts per stage, kept in one slot per slot_seconds so the oldest
+# slot can be dropped as time moves on; percentiles cover the whole window.
+class RollingHistogram:
+    def __init__(self, window_seconds=300, slot_seconds=10, clock=time.monotonic):
+        self.slot_seconds = slot_seconds
+        self.slot_count = max(1, int(window_seconds // slot_seconds))
+        self.clock = clock
+        self.slots = {}
+        # Largest value ever seen, unlike the percentiles which cover the window only
+        self.max_ms = 0.0
+
+    def add(self, milliseconds):
+        slot = int(self.clock() // self.slot_seconds)
+        counts = self.slots.get(slot)
+        if counts is None:
+            counts = self.slots[slot] = [0] * (len(BUCKETS_MS) + 1)
+            for old in [key for key in self.slots if key <= slot - self.slot_count]:
+                del self.slots[old]
+        counts[bisect.bisect_left(BUCKETS_MS, milliseconds)] += 1
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def counts(self):
+        oldest = int(self.clock() // self.slot_seconds) - self.slot_count
+        total = [0] * (len(BUCKETS_MS) + 1)
+        for slot, counts in self.slots.items():
+            if slot > oldest:
+                total = [a + b for a, b in zip(total, counts)]
+        return total
+
+    def percentiles(self, quantiles=(0.5, 0.9, 0.99)):
+        counts = self.counts()
+        count = sum(counts)
+        result = {'count': count}
+        for quantile in quantiles:
+            name = f"p{round(quantile * 100):d}_ms"
+            if not count:
+                result[name] = None
+                continue
+            target = quantile * count
+            seen = 0
+            for index, bucket_count in enumerate(counts):
+                seen += bucket_count
+                if seen >= target:
+                    # Upper bound of the bucket; the overflow bucket reports the largest bound
+                    result[name] = BUCKETS_MS[min(index, len(BUCKETS_MS) - 1)]
+                    break
+        result['max_ms'] = round(self.max_ms, 3)
+        return result
+
+
+class TapMetrics:
+    def __init__(self, window_seconds=300, slot_seconds=10):
+        self.lock = threading.Lock()
+        self.histograms = {stage: RollingHistogram(window_seconds, slot_seconds) for stage in STAGES + ['total']}
+        self.taps = 0
+
+    def record(self, trace):
+        with self.lock:
+            self.taps += 1
+            for stage, seconds in trace.durations():
+                self.histograms[stage].add(seconds * 1000)
+            self.histograms['total'].add(trace.total() * 1000)
+
+    def snapshot(self):
+        with self.lock:
+            stages = {stage: histogram.percentiles() for stage, histogram in self.histograms.items()}
+            return {'taps': self.taps, 'stages': stages}
+
+    def prometheus(self):
+        # Text exposition format, one histogram per stage over the rolling window
+        with self.lock:
+            lines = ['# HELP rfid_tap_stage_ms Time spent in each tap stage (rolling window).',
+                     '# TYPE rfid_tap_stage_ms histogram']
+            for stage, histogram in self.histograms.items():
+                counts = histogram.counts()
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS, counts):
+                    cumulative += count
+                    lines.append(f'rfid_tap_stage_ms_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'rfid_tap_stage_ms_bucket{{stage="{stage}",le="+Inf"}} {cumulative}')
+                lines.append(f'rfid_tap_stage_ms_count{{stage="{stage}"}} {cumulative}')
+            lines.append(f'rfid_taps_total {self.taps}')
+        return '\n'.join(lines) + '\n'
+
+    def write_file(self, path):
+        snapshot = self.snapshot()
+        snapshot['time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(snapshot, file, indent=2)
+        # Readers never see a half-written file
+        os.replace(temporary, path)
+
+
+class MetricsServer:
+    # GET /metrics (Prometheus text) or /metrics.json on a local port
+    def __init__(self, metrics, host='127.0.0.1', port=9108):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='MetricsServer', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsFileWriter(threading.Thread):
+    def __init__(self, metrics, path, interval_seconds=10):
+        super().__init__(name='MetricsFileWriter', daemon=True)
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval_seconds
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.metrics.write_file(self.path)
+            except OSError as e:
+                print(f"Metrics file error: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+        try:
+            self.metrics.write_file(self.path)
+        except OSError as e:
+            print(f"Metrics file error: {e}")
+
+
+def start_exporters(metrics, settings):
+    # settings is CONFIG['metrics']; returns the started exporters for stop_exporters()
+    exporters = []
+    if settings.get('file'):
+        exporters.append(MetricsFileWriter(metrics, settings['file'], settings['file_interval_seconds']))
+    if settings.get('port'):
+        try:
+            exporters.append(MetricsServer(metrics, settings['host'], settings['port']))
+        except OSError as e:
+            print(f"Metrics endpoint error on port {settings['port']}: {e}")
+    for exporter in exporters:
+        exporter.start()
+    return exporters
+
+
+def stop_exporters(exporters):
+    for exporter in exporters:
+        exporter.stop()
@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from log_export import export_access_log, ExportCancelled
+
+
+class LogExportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, path, filters=None):
+        super().__init__()
+        self.path = path
+        self.filters = filters or {}
+        self.cancel_requested = False
+
+    def run(self):
+        try:
+            written = export_access_log(self.path, self.filters, self.progress.emit,
+                                        lambda: self.cancel_requested)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.completed.emit(written)
+
+    def cancel(self):
+        self.cancel_requested = True
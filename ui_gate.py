@@ -0,0 +1,141 @@
+import html
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt, QTimer, QSize
+from PyQt5.QtGui import QColor, QIcon
+
+STATUS_STYLES = {
+    'ACCESS_GRANTED': ('Access Granted', '#28a745', '#d4edda'),
+    'ACCESS_DENIED': ('Access Denied - Inactive', '#dc3545', '#f8d7da'),
+    'UNKNOWN_CARD': ('Unknown Card', '#856404', '#fff3cd'),
+}
+
+
+# Live view of taps for whoever watches the gate. It is never modal: each tap
+# replaces the current entry in place and goes to the top of a short history,
+# whose entries drop off by themselves after history_seconds. The decision is
+# shown at once; card details and the photo fill in when the database worker
+# (db is an AsyncDatabase) and the photo cache deliver them.
+class GatePanel(QWidget):
+    def __init__(self, db, photo_cache, history_size=10, history_seconds=120, current_seconds=10, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.db = db
+        self.photo_cache = photo_cache
+        self.history_size = history_size
+        self.history_seconds = history_seconds
+        self.current_seconds = current_seconds
+        self.tap_count = 0
+        # Opening on a tap must not take the keyboard away from the main window
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setWindowTitle('Gate Display')
+        self.resize(520, 640)
+        self.setStyleSheet("QWidget { background-color: #f8f9fa; font-family: 'Segoe UI', Arial, sans-serif; }")
+        layout = QVBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
+        current_layout = QHBoxLayout()
+        self.photo_label = QLabel()
+        self.photo_label.setFixedSize(150, 150)
+        self.photo_label.setAlignment(Qt.AlignCenter)
+        self.photo_label.setStyleSheet("border: 2px solid #dee2e6; border-radius: 8px; color: #888888;")
+        current_layout.addWidget(self.photo_label)
+        self.details_label = QLabel()
+        self.details_label.setTextFormat(Qt.RichText)
+        self.details_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        current_layout.addWidget(self.details_label, 1)
+        layout.addLayout(current_layout)
+        layout.addWidget(QLabel('Recent taps:'))
+        self.history = QListWidget()
+        self.history.setIconSize(QSize(48, 48))
+        self.history.setStyleSheet("QListWidget { background-color: #ffffff; border: 1px solid #dee2e6; border-radius: 6px; font-size: 13px; }")
+        layout.addWidget(self.history, 1)
+        self.setLayout(layout)
+        self.current_timer = QTimer(self)
+        self.current_timer.setSingleShot(True)
+        self.current_timer.timeout.connect(self.show_waiting)
+        self.expire_timer = QTimer(self)
+        self.expire_timer.setInterval(1000)
+        self.expire_timer.timeout.connect(self.expire_history)
+        self.show_waiting()
+
+    def show_waiting(self):
+        self.status_label.setText('Waiting for RFID card...')
+        self.status_label.setStyleSheet("font-size: 22px; color: #6c757d; font-style: italic; padding: 16px; background-color: #e9ecef; border-radius: 8px;")
+        self.photo_label.clear()
+        self.details_label.clear()
+
+    def show_tap(self, decision):
+        self.tap_count += 1
+        tap = self.tap_count
+        title, color, background = STATUS_STYLES[decision.status]
+        known = decision.status != 'UNKNOWN_CARD'
+        self.status_label.setText(title)
+        self.status_label.setStyleSheet(f"font-size: 22px; color: {color}; font-weight: bold; padding: 16px; background-color: {background}; border-radius: 8px;")
+        tapped_at = time.strftime('%H:%M:%S')
+        self.show_details(decision, tapped_at)
+        self.photo_label.clear()
+
+        name = decision.full_name if known else decision.card_id
+        item = QListWidgetItem(f"{tapped_at}  {title}: {name}")
+        item.setForeground(QColor(color))
+        item.setData(Qt.UserRole, time.monotonic() + self.history_seconds)
+        self.history.insertItem(0, item)
+        while self.history.count() > self.history_size:
+            self.history.takeItem(self.history.count() - 1)
+        if not self.expire_timer.isActive():
+            self.expire_timer.start()
+
+        if known:
+            self.db.call('get_card_by_id', decision.card_id,
+                         callback=lambda card: self.show_card(tap, item, decision, tapped_at, card))
+        self.current_timer.start(int(self.current_seconds * 1000))
+        if not self.isVisible():
+            self.show()
+
+    def show_details(self, decision, tapped_at, card=None):
+        # Rich text: every value from the database or a reader is escaped
+        known = decision.status != 'UNKNOWN_CARD'
+        lines = [f"<h2>{html.escape(decision.full_name if known else decision.card_id)}</h2>"]
+        if card:
+            id_number = card[5] if card[5] else card[6]
+            lines.append(f"<p>{html.escape(card[4])} · {html.escape(id_number or '-')}<br>{html.escape(card[8])}</p>")
+        elif known:
+            lines.append(f"<p>{html.escape(decision.role)}</p>")
+        reader = f" at {html.escape(decision.reader_id)}" if decision.reader_id else ''
+        lines.append(f"<p style=\"color: #6c757d;\">Card {html.escape(decision.card_id)}<br>{tapped_at}{reader}</p>")
+        self.details_label.setText(''.join(lines))
+
+    def show_card(self, tap, item, decision, tapped_at, card):
+        # A later tap may already be showing; the history entry still gets its photo
+        current = tap == self.tap_count and self.current_timer.isActive()
+        if not card:
+            return
+        if current:
+            self.show_details(decision, tapped_at, card)
+        if not card[9]:
+            return
+        if current:
+            self.photo_label.setText('Loading...')
+
+        def show_photo(pixmap):
+            showing = tap == self.tap_count and self.current_timer.isActive()
+            if pixmap is None:
+                if showing:
+                    self.photo_label.setText('Photo Error')
+                return
+            if showing:
+                self.photo_label.setPixmap(pixmap)
+            item.setIcon(QIcon(pixmap))
+
+        self.photo_cache.request(decision.card_id, card[9],
+                                 lambda deliver: self.db.call('get_photo', decision.card_id, callback=deliver,
+                                                              errback=lambda error: deliver(None)),
+                                 show_photo)
+
+    def expire_history(self):
+        now = time.monotonic()
+        while self.history.count() and self.history.item(self.history.count() - 1).data(Qt.UserRole) <= now:
+            self.history.takeItem(self.history.count() - 1)
+        if not self.history.count():
+            self.expire_timer.stop()
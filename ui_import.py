@@ -0,0 +1,141 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QProgressBar, QFileDialog, QMessageBox
+from PyQt5.QtCore import QThread, pyqtSignal
+from bulk_import import import_roster, write_report
+from allowlist import publish_snapshot
+from config import CONFIG
+from database import allowlist_directory, open_connection
+
+
+class ImportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, roster_path, photo_dir, registered_by):
+        super().__init__()
+        self.roster_path = roster_path
+        self.photo_dir = photo_dir
+        self.registered_by = registered_by
+        self.cancel_requested = False
+
+    def run(self):
+        # Own connection: the GUI picks the new cards up from the published allowlist
+        conn = open_connection()
+        try:
+            result = import_roster(conn, self.roster_path, self.photo_dir, self.registered_by,
+                                   progress=self.progress.emit, is_cancelled=lambda: self.cancel_requested)
+            if result.inserted and CONFIG['allowlist']['enabled']:
+                publish_snapshot(conn, allowlist_directory())
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.completed.emit(result)
+        finally:
+            conn.close()
+
+    def cancel(self):
+        self.cancel_requested = True
+
+
+class ImportDialog(QDialog):
+    imported = pyqtSignal()
+
+    def __init__(self, admin_username, parent=None):
+        super().__init__(parent)
+        self.admin_username = admin_username
+        self.worker = None
+        self.issues = []
+        self.setWindowTitle('Import Users')
+        self.setMinimumWidth(520)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel('Roster file (CSV or JSON):'))
+        roster_layout = QHBoxLayout()
+        self.roster_edit = QLineEdit()
+        self.roster_edit.setPlaceholderText('card_id, first_name, last_name, role, school_id, employee_id, phone_number, program, photo')
+        roster_btn = QPushButton('Browse...')
+        roster_btn.clicked.connect(self.choose_roster)
+        roster_layout.addWidget(self.roster_edit)
+        roster_layout.addWidget(roster_btn)
+        layout.addLayout(roster_layout)
+        layout.addWidget(QLabel('Photo folder (optional):'))
+        photo_layout = QHBoxLayout()
+        self.photo_edit = QLineEdit()
+        self.photo_edit.setPlaceholderText('Photos named <card_id>.jpg/.png, or as listed in the photo column')
+        photo_btn = QPushButton('Browse...')
+        photo_btn.clicked.connect(self.choose_photo_dir)
+        photo_layout.addWidget(self.photo_edit)
+        photo_layout.addWidget(photo_btn)
+        layout.addLayout(photo_layout)
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel('')
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+        buttons = QHBoxLayout()
+        self.report_btn = QPushButton('Save Conflict Report')
+        self.report_btn.setEnabled(False)
+        self.report_btn.clicked.connect(self.save_report)
+        self.start_btn = QPushButton('Import')
+        self.start_btn.setObjectName('successBtn')
+        self.start_btn.clicked.connect(self.start_import)
+        self.close_btn = QPushButton('Close')
+        self.close_btn.clicked.connect(self.close)
+        buttons.addWidget(self.report_btn)
+        buttons.addStretch()
+        buttons.addWidget(self.start_btn)
+        buttons.addWidget(self.close_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def choose_roster(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Select Roster', '', 'Roster Files (*.csv *.json)')
+        if path:
+            self.roster_edit.setText(path)
+
+    def choose_photo_dir(self):
+        path = QFileDialog.getExistingDirectory(self, 'Select Photo Folder')
+        if path:
+            self.photo_edit.setText(path)
+
+    def start_import(self):
+        roster_path = self.roster_edit.text().strip()
+        if not roster_path:
+            QMessageBox.warning(self, 'Import', 'Please choose a roster file.')
+            return
+        self.start_btn.setEnabled(False)
+        self.report_btn.setEnabled(False)
+        self.status_label.setText('Importing...')
+        self.worker = ImportWorker(roster_path, self.photo_edit.text().strip() or None, self.admin_username)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.completed.connect(self.on_completed)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def on_progress(self, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+
+    def on_completed(self, result):
+        self.start_btn.setEnabled(True)
+        self.issues = result.issues
+        self.report_btn.setEnabled(bool(self.issues))
+        self.status_label.setText(
+            f'Imported {result.inserted} of {result.total} cards in {result.seconds:.1f}s. '
+            f'{len(self.issues)} rows rejected.')
+        self.imported.emit()
+
+    def on_failed(self, error):
+        self.start_btn.setEnabled(True)
+        self.status_label.setText('')
+        QMessageBox.warning(self, 'Import Error', f'Failed to import roster:\n{error}')
+
+    def save_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Save Conflict Report', 'import_report.csv', 'CSV Files (*.csv)')
+        if path:
+            write_report(path, self.issues)
+
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        event.accept()
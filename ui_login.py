@@ -1,12 +1,18 @@
+import importlib
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox, QDesktopWidget
-from PyQt5.QtCore import Qt
-from database import DatabaseManager
+from PyQt5.QtCore import Qt, QTimer
+from database import shared_database
+import startup_timing
 
 class LoginWindow(QWidget):
     def __init__(self):
         super().__init__()
-        self.db = DatabaseManager()
+        self.db = shared_database()
+        startup_timing.mark('database open')
         self.init_ui()
+        startup_timing.watch_first_paint(self, 'login window painted')
+        # Load the main window's modules while the admin is typing, not after Sign In
+        QTimer.singleShot(0, self.preload_main_window)
 
     def init_ui(self):
         self.setWindowTitle('CTU-CC RFID MANAGEMENT SYSTEM')
@@ -83,6 +89,10 @@ class LoginWindow(QWidget):
         cp = QDesktopWidget().availableGeometry().center()
         qr.moveCenter(cp)
         self.move(qr.topLeft())
+    def preload_main_window(self):
+        # Pays for the main window's imports while the admin is still typing
+        importlib.import_module('ui_main')
+
     def login(self):
         username = self.username_edit.text().strip()
         password = self.password_edit.text()
@@ -91,7 +101,10 @@ class LoginWindow(QWidget):
             return
         if self.db.verify_admin(username, password):
             from ui_main import MainWindow
+            startup_timing.mark('login accepted')
             self.main_window = MainWindow(username)
+            startup_timing.mark('main window built')
+            startup_timing.watch_first_paint(self.main_window, 'main window painted', startup_timing.report)
             self.main_window.show()
             self.close()
         else:
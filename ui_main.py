@@ -1,19 +1,47 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget, QGroupBox, QLineEdit, QComboBox, QTextEdit, QTableWidget, QTableWidgetItem, QAbstractItemView, QMenu, QDialog, QMessageBox, QFileDialog
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QIcon, QPixmap
-import base64
-import re
-from serial_reader import SerialReader
-from database import DatabaseManager
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget, QGroupBox, QLineEdit, QComboBox, QTextEdit, QTableWidget, QTableWidgetItem, QTableView, QAbstractItemView, QMenu, QDialog, QMessageBox, QFileDialog, QCheckBox, QDateEdit, QProgressDialog
+from PyQt5.QtCore import Qt, QTimer, QDate, pyqtSignal
+from PyQt5.QtGui import QIcon
+from serial_reader import SerialReader, GateEventReader
+from tap_filter import TapFilter
+from tap_metrics import TapMetrics, STAGES, start_exporters, stop_exporters
+from access_control import AccessController, AccessDecision
+from database import shared_database
+from db_worker import AsyncDatabase
 from ui_photo import PhotoWidget
+from photo_cache import PhotoCache
+from ui_gate import GatePanel
+from log_model import AccessLogModel
+from user_model import UserTableModel
 from ui_login import LoginWindow
+from config import CONFIG
 
 class MainWindow(QWidget):
+    logs_flushed = pyqtSignal()
+
     def __init__(self, admin_username):
         super().__init__()
         self.admin_username = admin_username
-        self.db = DatabaseManager()
+        self.db = shared_database()
+        # Everything the window reads or writes goes through the worker thread;
+        # tap decisions use only the in-memory allowlist and card cache.
+        self.async_db = AsyncDatabase(self.db, self)
+        self.access_controller = AccessController(self.db)
+        self.db.start_archiver()
+        # The log writer flushes on its own thread; the signal hops back to the GUI thread
+        self.logs_flushed.connect(self.load_access_logs)
+        self.logs_flushed.connect(self.refresh_dashboard_if_visible)
+        self.log_listener = self.logs_flushed.emit
+        self.db.add_log_listener(self.log_listener)
         self.serial_reader = None
+        self.connected_readers = set()
+        self.export_worker = None
+        self.users_model = None
+        self.logs_model = None
+        self.tap_metrics = TapMetrics(CONFIG['metrics']['window_seconds'])
+        self.metrics_exporters = start_exporters(self.tap_metrics, CONFIG['metrics'])
+        self.photo_cache = PhotoCache(150, CONFIG['ui']['photo_cache_size'], CONFIG['ui']['photo_decode_threads'], self)
+        self.gate_panel = GatePanel(self.async_db, self.photo_cache, CONFIG['ui']['gate_history_size'],
+                                    CONFIG['ui']['gate_history_seconds'], CONFIG['ui']['gate_current_seconds'], self)
         self.init_ui()
         self.setup_serial_connection()
 
@@ -27,8 +55,12 @@ class MainWindow(QWidget):
         self.create_header(main_layout)
         self.tab_widget = QTabWidget()
         self.tab_widget.addTab(self.create_register_tab(), "Register Card")
-        self.tab_widget.addTab(self.create_manage_users_tab(), "Manage Users")
-        self.tab_widget.addTab(self.create_view_logs_tab(), "View Logs")
+        # The data-heavy tabs are built, and their rows loaded, when first shown
+        self.lazy_tabs = {}
+        self.add_lazy_tab(self.create_manage_users_tab, "Manage Users")
+        self.add_lazy_tab(self.create_view_logs_tab, "View Logs")
+        self.dashboard_tab = self.add_lazy_tab(self.create_dashboard_tab, "Dashboard")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         main_layout.addWidget(self.tab_widget)
         self.setLayout(main_layout)
 
@@ -43,6 +75,17 @@ class MainWindow(QWidget):
         welcome_label.setStyleSheet("font-size: 24px; font-weight: bold; color: #333333;")
         self.serial_status = QLabel('🔴 Serial: Disconnected')
         self.serial_status.setStyleSheet("font-size: 14px; color: #333333; font-weight: bold;")
+        self.tap_latency = QLabel('Tap: -')
+        self.tap_latency.setStyleSheet("font-size: 12px; color: #6c757d;")
+        self.tap_latency_timer = QTimer(self)
+        self.tap_latency_timer.setInterval(2000)
+        self.tap_latency_timer.timeout.connect(self.update_tap_latency)
+        self.tap_latency_timer.start()
+        gate_btn = QPushButton('Gate Display')
+        gate_btn.setObjectName('primaryBtn')
+        gate_btn.setCursor(Qt.PointingHandCursor)
+        gate_btn.clicked.connect(self.show_gate_panel)
+        gate_btn.setFixedSize(140, 40)
         logout_btn = QPushButton('Logout')
         logout_btn.setObjectName('dangerBtn')
         logout_btn.setCursor(Qt.PointingHandCursor)
@@ -51,6 +94,8 @@ class MainWindow(QWidget):
         header_layout.addWidget(welcome_label)
         header_layout.addStretch()
         header_layout.addWidget(self.serial_status)
+        header_layout.addWidget(self.tap_latency)
+        header_layout.addWidget(gate_btn)
         header_layout.addWidget(logout_btn)
         header_widget.setLayout(header_layout)
         layout.addWidget(header_widget)
@@ -65,6 +110,10 @@ class MainWindow(QWidget):
         self.card_status = QLabel('Waiting for RFID card...')
         self.card_status.setStyleSheet("font-size: 14px; color: #6c757d; font-style: italic; padding: 10px; background-color: #f8f9fa; border-radius: 6px;")
         left_layout.addWidget(self.card_status)
+        # One timer, restarted by each tap, so a burst doesn't reset the status early
+        self.card_status_timer = QTimer(self)
+        self.card_status_timer.setSingleShot(True)
+        self.card_status_timer.timeout.connect(self.reset_card_status)
         left_layout.addWidget(QLabel('RFID Card ID:'))
         self.card_id_edit = QLineEdit()
         self.card_id_edit.setPlaceholderText('Scan card or enter manually')
@@ -139,22 +188,34 @@ class MainWindow(QWidget):
         search_label = QLabel('Search:')
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText('Search by name, ID, or program...')
-        self.search_edit.textChanged.connect(self.filter_users)
+        # Search runs once typing pauses instead of on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.filter_users)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         refresh_btn = QPushButton('Refresh')
         refresh_btn.setObjectName('primaryBtn')
         refresh_btn.clicked.connect(self.load_users)
+        import_btn = QPushButton('Import...')
+        import_btn.setObjectName('successBtn')
+        import_btn.clicked.connect(self.import_users)
+        bulk_btn = QPushButton('Bulk Status...')
+        bulk_btn.setObjectName('primaryBtn')
+        bulk_btn.clicked.connect(self.show_bulk_status_dialog)
         header_layout.addWidget(search_label)
         header_layout.addWidget(self.search_edit)
         header_layout.addWidget(refresh_btn)
+        header_layout.addWidget(import_btn)
+        header_layout.addWidget(bulk_btn)
         layout.addLayout(header_layout)
-        self.users_table = QTableWidget()
-        self.users_table.setColumnCount(9)
-        self.users_table.setHorizontalHeaderLabels([
-            'Card ID', 'Full Name', 'Role', 'ID Number', 'Phone', 'Program', 'Status', 'Registered By', 'Date'
-        ])
+        self.users_model = UserTableModel(self.async_db, CONFIG['ui']['user_page_size'])
+        self.users_table = QTableView()
+        self.users_table.setModel(self.users_model)
         self.users_table.horizontalHeader().setStretchLastSection(True)
         self.users_table.setAlternatingRowColors(True)
         self.users_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.users_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.users_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.users_table.customContextMenuRequested.connect(self.show_user_context_menu)
         layout.addWidget(self.users_table)
@@ -169,67 +230,222 @@ class MainWindow(QWidget):
         filter_label = QLabel('Filter:')
         self.log_filter_combo = QComboBox()
         self.log_filter_combo.addItems(['All Logs', 'Access Granted', 'Access Denied', 'Unknown Cards'])
+        self.log_role_combo = QComboBox()
+        self.log_role_combo.addItems(['All Roles', 'Student', 'Employee', 'Unknown'])
+        self.log_card_edit = QLineEdit()
+        self.log_card_edit.setPlaceholderText('Card ID')
+        self.log_card_edit.setFixedWidth(140)
+        self.log_date_check = QCheckBox('From')
+        self.log_date_from = QDateEdit(QDate.currentDate().addDays(-30))
+        self.log_date_from.setCalendarPopup(True)
+        self.log_date_to = QDateEdit(QDate.currentDate())
+        self.log_date_to.setCalendarPopup(True)
         self.log_filter_combo.currentTextChanged.connect(self.filter_logs)
+        self.log_role_combo.currentTextChanged.connect(self.filter_logs)
+        self.log_card_edit.returnPressed.connect(self.filter_logs)
+        self.log_date_check.toggled.connect(self.filter_logs)
+        self.log_date_from.dateChanged.connect(self.filter_logs)
+        self.log_date_to.dateChanged.connect(self.filter_logs)
         refresh_logs_btn = QPushButton('Refresh Logs')
         refresh_logs_btn.setObjectName('primaryBtn')
-        refresh_logs_btn.clicked.connect(self.load_access_logs)
+        refresh_logs_btn.clicked.connect(self.reload_access_logs)
         export_btn = QPushButton('Export Logs')
         export_btn.setObjectName('successBtn')
         export_btn.clicked.connect(self.export_logs)
         header_layout.addWidget(filter_label)
         header_layout.addWidget(self.log_filter_combo)
+        header_layout.addWidget(self.log_role_combo)
+        header_layout.addWidget(self.log_card_edit)
+        header_layout.addWidget(self.log_date_check)
+        header_layout.addWidget(self.log_date_from)
+        header_layout.addWidget(QLabel('To'))
+        header_layout.addWidget(self.log_date_to)
         header_layout.addStretch()
         header_layout.addWidget(refresh_logs_btn)
         header_layout.addWidget(export_btn)
         layout.addLayout(header_layout)
-        self.logs_table = QTableWidget()
-        self.logs_table.setColumnCount(5)
-        self.logs_table.setHorizontalHeaderLabels([
-            'Card ID', 'Full Name', 'Role', 'Status', 'Timestamp'
-        ])
+        self.logs_model = AccessLogModel(self.async_db, CONFIG['ui']['log_rows'])
+        self.logs_table = QTableView()
+        self.logs_table.setModel(self.logs_model)
         self.logs_table.horizontalHeader().setStretchLastSection(True)
         self.logs_table.setAlternatingRowColors(True)
         self.logs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         layout.addWidget(self.logs_table)
         widget.setLayout(layout)
-        self.load_access_logs()
+        self.reload_access_logs()
+        return widget
+
+    def create_dashboard_tab(self):
+        # Reads only the access_stats rollups, never access_log itself
+        widget = QWidget()
+        layout = QVBoxLayout()
+        header_layout = QHBoxLayout()
+        self.dashboard_totals = QLabel()
+        self.dashboard_totals.setStyleSheet("font-size: 16px; font-weight: bold; color: #333333;")
+        refresh_btn = QPushButton('Refresh')
+        refresh_btn.setObjectName('primaryBtn')
+        refresh_btn.clicked.connect(self.refresh_dashboard)
+        header_layout.addWidget(self.dashboard_totals)
+        header_layout.addStretch()
+        header_layout.addWidget(refresh_btn)
+        layout.addLayout(header_layout)
+        tables_layout = QHBoxLayout()
+        hourly_panel = QGroupBox("Today's Taps per Hour")
+        hourly_layout = QVBoxLayout()
+        self.hourly_table = QTableWidget(24, 3)
+        self.hourly_table.setHorizontalHeaderLabels(['Granted', 'Denied', 'Unknown'])
+        self.hourly_table.setVerticalHeaderLabels([f'{hour:02d}:00' for hour in range(24)])
+        self.hourly_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.hourly_table.horizontalHeader().setStretchLastSection(True)
+        hourly_layout.addWidget(self.hourly_table)
+        hourly_panel.setLayout(hourly_layout)
+        program_panel = QGroupBox('Attendance per Program (Last 7 Days)')
+        program_layout = QVBoxLayout()
+        self.program_table = QTableWidget(0, 3)
+        self.program_table.setHorizontalHeaderLabels(['Program', 'Role', 'Granted Taps'])
+        self.program_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.program_table.horizontalHeader().setStretchLastSection(True)
+        program_layout.addWidget(self.program_table)
+        program_panel.setLayout(program_layout)
+        tables_layout.addWidget(hourly_panel)
+        tables_layout.addWidget(program_panel)
+        layout.addLayout(tables_layout)
+        widget.setLayout(layout)
         return widget
 
+    def add_lazy_tab(self, create, title):
+        page = QWidget()
+        page_layout = QVBoxLayout()
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        page.setLayout(page_layout)
+        self.lazy_tabs[page] = create
+        self.tab_widget.addTab(page, title)
+        return page
+
+    def on_tab_changed(self, index):
+        page = self.tab_widget.widget(index)
+        create = self.lazy_tabs.pop(page, None)
+        if create is not None:
+            page.layout().addWidget(create())
+        if page is self.dashboard_tab:
+            self.refresh_dashboard()
+
+    def refresh_dashboard_if_visible(self):
+        if self.tab_widget.currentWidget() is self.dashboard_tab:
+            self.refresh_dashboard()
+
+    def refresh_dashboard(self):
+        today = QDate.currentDate()
+        self.async_db.call('get_dashboard_stats', today.toString('yyyy-MM-dd'),
+                           today.addDays(-6).toString('yyyy-MM-dd'), key='dashboard', callback=self.show_dashboard)
+
+    def show_dashboard(self, stats):
+        totals, hourly, programs = stats
+        self.dashboard_totals.setText(
+            f"Today: {totals.get('ACCESS_GRANTED', 0)} granted · "
+            f"{totals.get('ACCESS_DENIED', 0)} denied · {totals.get('UNKNOWN_CARD', 0)} unknown")
+        for hour in range(24):
+            counts = hourly.get(hour, {})
+            for column, status in enumerate(['ACCESS_GRANTED', 'ACCESS_DENIED', 'UNKNOWN_CARD']):
+                self.hourly_table.setItem(hour, column, QTableWidgetItem(str(counts.get(status, 0))))
+        self.program_table.setRowCount(len(programs))
+        for row, (program, role, count) in enumerate(programs):
+            self.program_table.setItem(row, 0, QTableWidgetItem(program))
+            self.program_table.setItem(row, 1, QTableWidgetItem(role))
+            self.program_table.setItem(row, 2, QTableWidgetItem(str(count)))
+
     def setup_serial_connection(self):
+        gate = CONFIG['gate']
         try:
-            self.serial_reader = SerialReader('COM3', 9600)
-            self.serial_reader.card_detected.connect(self.on_card_detected)
+            if gate['mode'] == 'daemon':
+                self.serial_reader = GateEventReader(gate['host'], gate['port'])
+                self.serial_reader.gate_event.connect(self.on_gate_event)
+                self.serial_reader.connection_status.connect(self.on_gate_daemon_status)
+            else:
+                settings = CONFIG['serial']
+                self.serial_reader = SerialReader(settings['readers'], settings['reconnect_interval'],
+                                                  settings['poll_interval_ms'],
+                                                  TapFilter(CONFIG['tap_filter']['dedup_seconds']))
+                self.serial_reader.card_detected.connect(self.on_card_detected)
+                self.serial_reader.reader_status.connect(self.on_reader_status)
             self.serial_reader.start()
-            self.serial_status.setText('🟢 Serial: Connected')
         except Exception as e:
             self.serial_status.setText('🔴 Serial: Error')
             print(f'Serial connection error: {e}')
 
-    def on_card_detected(self, card_id):
-        if not card_id or not re.fullmatch(r'[0-9A-Fa-f]{8,12}', card_id):
-            return
-        card_info = self.db.get_card_by_id(card_id)
-        if card_info:
-            full_name = f"{card_info[2]} {card_info[3]}"
-            role = card_info[4]
-            status = card_info[10]
-            if status == 'Active':
-                self.card_status.setText(f'Access Granted: {full_name} ({role})')
-                self.card_status.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold; padding: 10px; background-color: #d4edda; border-radius: 6px;")
-                self.db.log_access(card_id, full_name, role, 'ACCESS_GRANTED')
-                self.show_user_details(card_id)
-            else:
-                self.card_status.setText(f'Access Denied: {full_name} ({role}) - Inactive')
-                self.card_status.setStyleSheet("font-size: 14px; color: #dc3545; font-weight: bold; padding: 10px; background-color: #f8d7da; border-radius: 6px;")
-                self.db.log_access(card_id, full_name, role, 'ACCESS_DENIED')
-                self.show_user_details(card_id)
+    def on_gate_daemon_status(self, connected):
+        if connected:
+            self.serial_status.setText('🟢 Gate daemon: Connected')
+        else:
+            self.serial_status.setText('🔴 Gate daemon: Disconnected')
+
+    def on_gate_event(self, event):
+        if event['type'] == 'decision':
+            self.show_access_decision(AccessDecision(event['card_id'], event['full_name'], event['role'],
+                                                     event['status'], event['reader_id']))
+        elif event['type'] == 'logs_flushed':
+            self.load_access_logs()
+
+    def on_reader_status(self, reader_id, connected):
+        if connected:
+            self.connected_readers.add(reader_id)
         else:
-            self.card_status.setText(f'Unknown Card: {card_id}')
+            self.connected_readers.discard(reader_id)
+        total = self.serial_reader.reader_count()
+        if not self.connected_readers:
+            self.serial_status.setText('🔴 Serial: Disconnected')
+        elif total == 1:
+            self.serial_status.setText('🟢 Serial: Connected')
+        else:
+            icon = '🟢' if len(self.connected_readers) == total else '🟡'
+            self.serial_status.setText(f'{icon} Serial: {len(self.connected_readers)}/{total} readers')
+
+    def on_card_detected(self, card_id, reader_id=None, trace=None):
+        if trace:
+            trace.mark('queue')
+        decision = self.access_controller.decide(card_id, reader_id, trace)
+        if decision:
+            self.show_access_decision(decision, trace)
+
+    def show_access_decision(self, decision, trace=None):
+        # Daemon-mode decisions arrive without a trace; the daemon records their timings itself
+        full_name = decision.full_name
+        role = decision.role
+        if decision.status == 'ACCESS_GRANTED':
+            self.card_status.setText(f'Access Granted: {full_name} ({role})')
+            self.card_status.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold; padding: 10px; background-color: #d4edda; border-radius: 6px;")
+        elif decision.status == 'ACCESS_DENIED':
+            self.card_status.setText(f'Access Denied: {full_name} ({role}) - Inactive')
+            self.card_status.setStyleSheet("font-size: 14px; color: #dc3545; font-weight: bold; padding: 10px; background-color: #f8d7da; border-radius: 6px;")
+        else:
+            self.card_status.setText(f'Unknown Card: {decision.card_id}')
             self.card_status.setStyleSheet("font-size: 14px; color: #ffc107; font-weight: bold; padding: 10px; background-color: #fff3cd; border-radius: 6px;")
-            self.db.log_access(card_id, 'Unknown', 'Unknown', 'UNKNOWN_CARD')
-            self.card_id_edit.setText(card_id)
-        self.load_access_logs()
-        QTimer.singleShot(5000, self.reset_card_status)
+            self.card_id_edit.setText(decision.card_id)
+        if trace:
+            trace.mark('ui_update')
+        self.card_status_timer.start(5000)
+        self.gate_panel.show_tap(decision)
+        if trace:
+            trace.mark('display')
+            self.tap_metrics.record(trace)
+
+    def show_gate_panel(self):
+        self.gate_panel.show()
+        self.gate_panel.raise_()
+        self.gate_panel.activateWindow()
+
+    def update_tap_latency(self):
+        stages = self.tap_metrics.snapshot()['stages']
+        total = stages['total']
+        if not total['count']:
+            return
+        self.tap_latency.setText(f"Tap p50 {total['p50_ms']:.0f} ms · p99 {total['p99_ms']:.0f} ms")
+        lines = [f"Last {CONFIG['metrics']['window_seconds'] // 60} min, {total['count']} taps"]
+        for stage in STAGES:
+            timing = stages[stage]
+            if timing['count']:
+                lines.append(f"{stage}: p50 {timing['p50_ms']:.2f} ms · p99 {timing['p99_ms']:.2f} ms")
+        self.tap_latency.setToolTip('\n'.join(lines))
 
     def reset_card_status(self):
         self.card_status.setText('Waiting for RFID card...')
@@ -308,9 +524,18 @@ class MainWindow(QWidget):
             self.photo_widget.get_photo_data(),
             self.admin_username
         )
-        if self.db.add_rfid_card(card_data):
+        self.async_db.call('add_rfid_card', card_data,
+                           callback=lambda added: self.on_user_registered(added, role, f'{card_data[1]} {card_data[2]}'),
+                           errback=self.database_error('Registration Failed', 'The card could not be registered'))
+
+    def database_error(self, title, message):
+        # Errback for worker calls the admin is waiting on
+        return lambda error: QMessageBox.warning(self, title, f'{message}:\n{error}')
+
+    def on_user_registered(self, added, role, full_name):
+        if added:
             QMessageBox.information(self, 'Success', 
-                                  f'{role} registered successfully!\n\nName: {self.first_name_edit.text()} {self.last_name_edit.text()}')
+                                  f'{role} registered successfully!\n\nName: {full_name}')
             self.clear_registration_form()
             self.load_users()
         else:
@@ -328,69 +553,127 @@ class MainWindow(QWidget):
         self.preview_text.clear()
 
     def load_users(self):
-        users = self.db.get_all_cards()
-        self.users_table.setRowCount(len(users))
-        for row, user in enumerate(users):
-            self.users_table.setItem(row, 0, QTableWidgetItem(user[1]))
-            self.users_table.setItem(row, 1, QTableWidgetItem(f"{user[2]} {user[3]}"))
-            self.users_table.setItem(row, 2, QTableWidgetItem(user[4]))
-            id_number = user[5] if user[5] else user[6]
-            self.users_table.setItem(row, 3, QTableWidgetItem(id_number or ''))
-            self.users_table.setItem(row, 4, QTableWidgetItem(user[7] or ''))
-            self.users_table.setItem(row, 5, QTableWidgetItem(user[8]))
-            status_item = QTableWidgetItem(user[10])
-            if user[10] == 'Active':
-                status_item.setBackground(QColor('#d4edda'))
-                status_item.setForeground(QColor('#155724'))
-            else:
-                status_item.setBackground(QColor('#f8d7da'))
-                status_item.setForeground(QColor('#721c24'))
-            self.users_table.setItem(row, 6, status_item)
-            self.users_table.setItem(row, 7, QTableWidgetItem(user[11]))
-            self.users_table.setItem(row, 8, QTableWidgetItem(user[12]))
+        if self.users_model is not None:
+            self.users_model.reload()
+
+    def import_users(self):
+        from ui_import import ImportDialog
+        dialog = ImportDialog(self.admin_username, self)
+        dialog.setStyleSheet(self.styleSheet())
+        dialog.imported.connect(self.load_users)
+        dialog.exec_()
 
     def filter_users(self):
-        search_text = self.search_edit.text().lower()
-        for row in range(self.users_table.rowCount()):
-            match = False
-            for col in range(self.users_table.columnCount()):
-                item = self.users_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            self.users_table.setRowHidden(row, not match)
+        self.users_model.set_search(self.search_edit.text())
 
     def show_user_context_menu(self, position):
-        if self.users_table.itemAt(position) is None:
+        index = self.users_table.indexAt(position)
+        if not index.isValid():
             return
+        selection = self.users_table.selectionModel()
+        if not selection.isRowSelected(index.row(), index.parent()):
+            self.users_table.selectRow(index.row())
+        card_ids = [self.users_model.card_id(row.row()) for row in selection.selectedRows()]
+        count = len(card_ids)
         menu = QMenu()
         view_action = menu.addAction("View Details")
+        view_action.setEnabled(count == 1)
         menu.addSeparator()
-        activate_action = menu.addAction("Set Active")
-        deactivate_action = menu.addAction("Set Inactive")
+        activate_action = menu.addAction("Set Active" if count == 1 else f"Set {count} Active")
+        deactivate_action = menu.addAction("Set Inactive" if count == 1 else f"Set {count} Inactive")
         menu.addSeparator()
-        delete_action = menu.addAction("Delete User")
+        delete_action = menu.addAction("Delete User" if count == 1 else f"Delete {count} Users")
         action = menu.exec_(self.users_table.mapToGlobal(position))
         if action:
-            row = self.users_table.currentRow()
-            card_id = self.users_table.item(row, 0).text()
             if action == view_action:
-                self.show_user_details(card_id)
+                self.show_user_details(card_ids[0])
             elif action == activate_action:
-                self.db.update_card_status(card_id, 'Active')
-                self.load_users()
+                self.set_users_status(card_ids, 'Active')
             elif action == deactivate_action:
-                self.db.update_card_status(card_id, 'Inactive')
-                self.load_users()
+                self.set_users_status(card_ids, 'Inactive')
             elif action == delete_action:
-                reply = QMessageBox.question(self, 'Confirm Delete', 
-                                           f'Are you sure you want to delete user with card ID: {card_id}?')
+                if count == 1:
+                    message = f'Are you sure you want to delete user with card ID: {card_ids[0]}?'
+                else:
+                    message = f'Are you sure you want to delete {count} users?'
+                reply = QMessageBox.question(self, 'Confirm Delete', message)
                 if reply == QMessageBox.Yes:
-                    self.db.delete_card(card_id)
-                    self.load_users()
+                    self.async_db.call('delete_cards', card_ids, callback=self.on_users_deleted,
+                                       errback=self.database_error('Delete Failed', 'The users could not be deleted'))
+
+    def on_users_deleted(self, deleted):
+        self.users_model.remove_cards(deleted)
+        for card_id in deleted:
+            self.photo_cache.remove(card_id)
+
+    def set_users_status(self, card_ids, status):
+        self.async_db.call('update_cards_status', card_ids, status,
+                           callback=lambda changed: self.users_model.set_status(changed, status),
+                           errback=self.database_error('Status Change Failed', 'The status could not be changed'))
+
+    def show_bulk_status_dialog(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle('Bulk Status Change')
+        dialog.setStyleSheet(self.styleSheet())
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel('Role:'))
+        role_combo = QComboBox()
+        role_combo.addItems(['All Roles', 'Student', 'Employee'])
+        layout.addWidget(role_combo)
+        layout.addWidget(QLabel('Program:'))
+        program_combo = QComboBox()
+        program_combo.addItem('All Programs')
+        def add_programs(programs):
+            try:
+                program_combo.addItems(programs)
+            except RuntimeError:
+                # The dialog was closed and deleted before the programs arrived
+                pass
+
+        self.async_db.call('get_programs', callback=add_programs)
+        layout.addWidget(program_combo)
+        layout.addWidget(QLabel('Set status to:'))
+        status_combo = QComboBox()
+        status_combo.addItems(['Inactive', 'Active'])
+        layout.addWidget(status_combo)
+        buttons = QHBoxLayout()
+        apply_btn = QPushButton('Apply')
+        apply_btn.setObjectName('dangerBtn')
+        apply_btn.clicked.connect(dialog.accept)
+        cancel_btn = QPushButton('Cancel')
+        cancel_btn.clicked.connect(dialog.reject)
+        buttons.addStretch()
+        buttons.addWidget(apply_btn)
+        buttons.addWidget(cancel_btn)
+        layout.addLayout(buttons)
+        dialog.setLayout(layout)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        status = status_combo.currentText()
+        role = role_combo.currentText() if role_combo.currentIndex() > 0 else None
+        program = program_combo.currentText() if program_combo.currentIndex() > 0 else None
+        self.async_db.call('count_cards_by_filter', status, role, program,
+                           callback=lambda count: self.confirm_bulk_status(status, role, program, count),
+                           errback=self.database_error('Bulk Status Change', 'The matching users could not be counted'))
+
+    def confirm_bulk_status(self, status, role, program, count):
+        if count == 0:
+            QMessageBox.information(self, 'Bulk Status Change', 'No users match that filter.')
+            return
+        scope = f'{role}s' if role else 'users'
+        if program:
+            scope += f' in {program}'
+        reply = QMessageBox.question(self, 'Confirm Status Change', f'Set {count} {scope} to {status}?')
+        if reply == QMessageBox.Yes:
+            self.async_db.call('update_status_by_filter', status, role, program,
+                               callback=lambda changed: self.users_model.set_status(changed, status),
+                               errback=self.database_error('Bulk Status Change', 'The status could not be changed'))
 
     def show_user_details(self, card_id):
-        user_info = self.db.get_card_by_id(card_id)
+        self.async_db.call('get_card_by_id', card_id, callback=self.open_user_details,
+                           errback=self.database_error('User Details', 'The user could not be loaded'))
+
+    def open_user_details(self, user_info):
         if not user_info:
             return
         dialog = QDialog(self)
@@ -404,13 +687,23 @@ class MainWindow(QWidget):
             photo_label.setStyleSheet("border: 2px solid #dee2e6; border-radius: 8px;")
             photo_label.setAlignment(Qt.AlignCenter)
             photo_label.setScaledContents(True)
-            try:
-                image_data = base64.b64decode(user_info[9])
-                pixmap = QPixmap()
-                pixmap.loadFromData(image_data)
-                photo_label.setPixmap(pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            except:
-                photo_label.setText("Photo Error")
+            photo_label.setText("Loading...")
+
+            def show_photo(pixmap):
+                try:
+                    if pixmap is None:
+                        photo_label.setText("Photo Error")
+                    else:
+                        photo_label.setPixmap(pixmap)
+                except RuntimeError:
+                    # The dialog was closed before the photo finished decoding
+                    pass
+
+            card_id = user_info[1]
+            self.photo_cache.request(card_id, user_info[9],
+                                     lambda deliver: self.async_db.call('get_photo', card_id, callback=deliver,
+                                                                        errback=lambda error: deliver(None)),
+                                     show_photo)
             photo_layout = QHBoxLayout()
             photo_layout.addStretch()
             photo_layout.addWidget(photo_label)
@@ -451,58 +744,72 @@ class MainWindow(QWidget):
         dialog.exec_()
 
     def load_access_logs(self):
-        logs = self.db.get_access_log(200)
-        self.logs_table.setRowCount(len(logs))
-        for row, log in enumerate(logs):
-            self.logs_table.setItem(row, 0, QTableWidgetItem(log[1]))
-            self.logs_table.setItem(row, 1, QTableWidgetItem(log[2]))
-            self.logs_table.setItem(row, 2, QTableWidgetItem(log[3]))
-            status_item = QTableWidgetItem(log[4])
-            if log[4] == 'ACCESS_GRANTED':
-                status_item.setBackground(QColor('#d4edda'))
-                status_item.setForeground(QColor('#155724'))
-            elif log[4] == 'ACCESS_DENIED':
-                status_item.setBackground(QColor('#f8d7da'))
-                status_item.setForeground(QColor('#721c24'))
-            else:
-                status_item.setBackground(QColor('#fff3cd'))
-                status_item.setForeground(QColor('#856404'))
-            self.logs_table.setItem(row, 3, status_item)
-            self.logs_table.setItem(row, 4, QTableWidgetItem(log[5]))
+        if self.logs_model is not None:
+            self.logs_model.refresh()
+
+    def reload_access_logs(self):
+        self.logs_model.reload()
+
+    def log_filters(self):
+        statuses = {
+            'Access Granted': 'ACCESS_GRANTED',
+            'Access Denied': 'ACCESS_DENIED',
+            'Unknown Cards': 'UNKNOWN_CARD',
+        }
+        role = self.log_role_combo.currentText()
+        filters = {
+            'status': statuses.get(self.log_filter_combo.currentText()),
+            'role': role if role != 'All Roles' else None,
+            'card_id': self.log_card_edit.text().strip().upper() or None,
+        }
+        if self.log_date_check.isChecked():
+            filters['date_from'] = self.log_date_from.date().toString('yyyy-MM-dd')
+            filters['date_to'] = self.log_date_to.date().toString('yyyy-MM-dd')
+        return filters
 
     def filter_logs(self):
-        filter_text = self.log_filter_combo.currentText()
-        for row in range(self.logs_table.rowCount()):
-            status_item = self.logs_table.item(row, 3)
-            if not status_item:
-                continue
-            status = status_item.text()
-            show_row = True
-            if filter_text == 'Access Granted' and status != 'ACCESS_GRANTED':
-                show_row = False
-            elif filter_text == 'Access Denied' and status != 'ACCESS_DENIED':
-                show_row = False
-            elif filter_text == 'Unknown Cards' and status != 'UNKNOWN_CARD':
-                show_row = False
-            self.logs_table.setRowHidden(row, not show_row)
+        self.logs_model.set_filters(**self.log_filters())
 
     def export_logs(self):
+        if self.export_worker and self.export_worker.isRunning():
+            QMessageBox.information(self, 'Export Running', 'An export is already in progress.')
+            return
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Export Access Logs", 
             "access_logs.csv",
-            "CSV Files (*.csv)"
+            "CSV Files (*.csv);;Compressed CSV Files (*.csv.gz)"
         )
         if file_path:
-            try:
-                with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                    file.write("Card ID,Full Name,Role,Status,Timestamp\n")
-                    logs = self.db.get_access_log(1000)
-                    for log in logs:
-                        file.write(f'"{log[1]}","{log[2]}","{log[3]}","{log[4]}","{log[5]}"\n')
-                QMessageBox.information(self, 'Export Complete', 
-                                      f'Access logs exported successfully to:\n{file_path}')
-            except Exception as e:
-                QMessageBox.warning(self, 'Export Error', f'Failed to export logs:\n{str(e)}')
+            # Exports everything matching the current log filters, streamed on a worker thread
+            self.export_progress = QProgressDialog('Exporting access logs...', 'Cancel', 0, 100, self)
+            self.export_progress.setWindowTitle('Export Access Logs')
+            self.export_progress.setMinimumDuration(500)
+            self.export_progress.setValue(0)
+            from ui_export import LogExportWorker
+            self.export_worker = LogExportWorker(file_path, self.log_filters())
+            self.export_worker.progress.connect(self.on_export_progress)
+            self.export_worker.completed.connect(
+                lambda written: self.on_export_finished(
+                    'Export Complete', f'{written} access log entries exported successfully to:\n{file_path}'))
+            self.export_worker.failed.connect(
+                lambda error: self.on_export_finished('Export Error', f'Failed to export logs:\n{error}', True))
+            self.export_worker.cancelled.connect(lambda: self.on_export_finished(None, None))
+            self.export_progress.canceled.connect(self.export_worker.cancel)
+            self.export_worker.start()
+
+    def on_export_progress(self, written, total):
+        if total:
+            self.export_progress.setValue(min(99, written * 100 // total))
+            self.export_progress.setLabelText(f'Exporting access logs... {written} of {total}')
+
+    def on_export_finished(self, title, message, error=False):
+        self.export_progress.reset()
+        if title is None:
+            return
+        if error:
+            QMessageBox.warning(self, title, message)
+        else:
+            QMessageBox.information(self, title, message)
 
     def logout(self):
         reply = QMessageBox.question(self, 'Logout Confirmation', 
@@ -517,4 +824,17 @@ class MainWindow(QWidget):
     def closeEvent(self, event):
         if self.serial_reader:
             self.serial_reader.stop()
+        if self.export_worker:
+            self.export_worker.cancel()
+            self.export_worker.wait()
+        # Queued writes finish before the login window gets the connection back
+        self.async_db.stop()
+        # The connection is shared with the login window; only this window's threads stop here
+        self.db.remove_log_listener(self.log_listener)
+        self.db.stop_background()
+        self.tap_latency_timer.stop()
+        stop_exporters(self.metrics_exporters)
+        self.metrics_exporters = []
+        self.gate_panel.close()
+        self.photo_cache.shutdown()
         event.accept() 
\ No newline at end of file
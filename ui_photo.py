@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QLabel, QMenu, QFileDialog, QMessageBox
 from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QPixmap, QCursor
-import base64
+from photo_utils import normalize_photo
 
 class PhotoWidget(QLabel):
     photo_changed = pyqtSignal()
@@ -53,13 +53,14 @@ class PhotoWidget(QLabel):
         QMessageBox.information(self, "Camera", "Camera capture would be implemented here.\nFor now, please use 'Upload Photo'.")
     
     def load_photo(self, file_path):
-        pixmap = QPixmap(file_path)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.setPixmap(scaled_pixmap)
-            with open(file_path, 'rb') as f:
-                self.photo_data = base64.b64encode(f.read()).decode()
-            self.photo_changed.emit()
+        # Stored downscaled and re-encoded, not as whatever file was picked
+        with open(file_path, 'rb') as f:
+            photo_data = normalize_photo(f.read())
+        if photo_data is None:
+            QMessageBox.warning(self, "Photo", "The selected file is not a readable image.")
+            return
+        self.set_photo_data(photo_data)
+        self.photo_changed.emit()
     
     def clear_photo(self):
         self.clear()
@@ -73,9 +74,8 @@ class PhotoWidget(QLabel):
     def set_photo_data(self, photo_data):
         if photo_data:
             try:
-                image_data = base64.b64decode(photo_data)
                 pixmap = QPixmap()
-                pixmap.loadFromData(image_data)
+                pixmap.loadFromData(photo_data)
                 scaled_pixmap = pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
                 self.setPixmap(scaled_pixmap)
                 self.photo_data = photo_data
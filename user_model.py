@@ -0,0 +1,144 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+ACTIVE_COLORS = (QColor('#d4edda'), QColor('#155724'))
+INACTIVE_COLORS = (QColor('#f8d7da'), QColor('#721c24'))
+
+STATUS_COLUMN = 6
+
+
+class UserTableModel(QAbstractTableModel):
+    headers = ['Card ID', 'Full Name', 'Role', 'ID Number', 'Phone', 'Program', 'Status', 'Registered By', 'Date']
+
+    def __init__(self, db, page_size=200):
+        super().__init__()
+        # db is an AsyncDatabase; pages arrive through callbacks
+        self.db = db
+        self.page_size = page_size
+        self.search = ''
+        self.rows = []
+        self.exhausted = False
+        self.loading = False
+        # Bumped by reload so pages requested before it are dropped
+        self.generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        user = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return self.display_value(user, column)
+        if column == STATUS_COLUMN and role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            background, foreground = ACTIVE_COLORS if user[9] == 'Active' else INACTIVE_COLORS
+            return background if role == Qt.BackgroundRole else foreground
+        return None
+
+    def display_value(self, user, column):
+        # user: (id, card_id, first_name, last_name, role, school_id, employee_id,
+        #        phone_number, program, status, registered_by, created_at)
+        if column == 0:
+            return user[1]
+        if column == 1:
+            return f"{user[2]} {user[3]}"
+        if column == 2:
+            return user[4]
+        if column == 3:
+            return user[5] or user[6] or ''
+        if column == 4:
+            return user[7] or ''
+        if column == 5:
+            return user[8]
+        if column == 6:
+            return user[9]
+        if column == 7:
+            return user[10] or ''
+        return user[11] or ''
+
+    def card_id(self, row):
+        return self.rows[row][1]
+
+    def set_status(self, card_ids, status):
+        # Updates loaded rows in place; rows not fetched yet will be read fresh
+        card_ids = set(card_ids)
+        for row, user in enumerate(self.rows):
+            if user[1] in card_ids and user[9] != status:
+                self.rows[row] = user[:9] + (status,) + user[10:]
+                index = self.index(row, STATUS_COLUMN)
+                self.dataChanged.emit(index, index)
+
+    def remove_cards(self, card_ids):
+        card_ids = set(card_ids)
+        row = len(self.rows) - 1
+        # Walk backwards removing each contiguous run of matching rows at once
+        while row >= 0:
+            if self.rows[row][1] not in card_ids:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self.rows[row][1] in card_ids:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self.rows[row + 1:last + 1]
+            self.endRemoveRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.loading:
+            return
+        self.request_page(self.rows)
+
+    def request_page(self, rows):
+        # rows: those the page follows; empty for the first page, which replaces what is shown
+        self.loading = True
+        generation = self.generation
+        first = not rows
+        if self.search:
+            method, args = 'search_cards', (self.search, len(rows), self.page_size)
+        else:
+            after = (rows[-1][11], rows[-1][0]) if rows else None
+            method, args = 'get_cards_page', (after, self.page_size)
+        self.db.call(method, *args, key='users_page',
+                     callback=lambda page: self.add_page(generation, page, first),
+                     errback=lambda error: self.page_failed(generation))
+
+    def add_page(self, generation, page, first):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = len(page) < self.page_size
+        if first:
+            self.beginResetModel()
+            self.rows = list(page)
+            self.endResetModel()
+        elif page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def page_failed(self, generation):
+        if generation == self.generation:
+            self.loading = False
+
+    def reload(self):
+        # The current rows stay up until the first page of the new list arrives
+        self.generation += 1
+        self.exhausted = False
+        self.request_page([])
+
+    def set_search(self, text):
+        self.search = text.strip()
+        self.reload()